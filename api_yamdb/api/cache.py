@@ -0,0 +1,89 @@
+"""Кэширование ответов API с инвалидацией по штампу версии.
+
+Штамп версии — метка времени со случайным суффиксом, хранимая в кэше.
+Он входит в ключи сохранённых ответов и в ETag, а запись в связанные
+модели заменяет штамп, после чего старые ответы и ETag перестают
+совпадать. В отличие от счётчика, вытесненный из кэша штамп
+не может повторить старое значение, поэтому штампы хранятся
+ограниченное время в отдельном кэше versions: вытеснение ответов
+их не затрагивает, а штампы несуществующих объектов истекают.
+"""
+
+from hashlib import md5
+from time import time_ns
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.db import transaction
+
+from api.constants import VERSION_STAMP_TIMEOUT
+
+TITLES_VERSION_KEY = 'titles:version'
+TAXONOMY_VERSION_KEY = 'taxonomy:version'
+USERS_VERSION_KEY = 'users:version'
+
+
+def title_version_key(title_id):
+    return f'title:{title_id}:version'
+
+
+def reviews_version_key(title_id):
+    return f'title:{title_id}:reviews:version'
+
+
+def comments_version_key(review_id):
+    return f'review:{review_id}:comments:version'
+
+
+def new_stamp():
+    return f'{time_ns()}.{uuid4().hex}'
+
+
+def stamp_timestamp(stamp):
+    """Время смены штампа в секундах."""
+    return int(stamp.split('.', 1)[0]) // 10 ** 9
+
+
+def get_versions(version_keys):
+    """Штампы для списка ключей; отсутствующие создаются."""
+    versions = caches['versions']
+    stamps = versions.get_many(version_keys)
+    for key in version_keys:
+        if key not in stamps:
+            versions.add(key, new_stamp(), VERSION_STAMP_TIMEOUT)
+            stamps[key] = versions.get(key)
+    return [stamps[key] for key in version_keys]
+
+
+def get_version(version_key):
+    return get_versions([version_key])[0]
+
+
+def bump_version(*version_keys):
+    """Меняет штампы после фиксации транзакции.
+
+    Ответ, собранный до фиксации, сохраняется под старым штампом,
+    поэтому устаревшие данные не попадают в кэш новой версии.
+    """
+    transaction.on_commit(lambda: caches['versions'].set_many(
+        {key: new_stamp() for key in version_keys}, VERSION_STAMP_TIMEOUT
+    ))
+
+
+def get_normalized_url(request):
+    """Абсолютный адрес запроса с отсортированными параметрами."""
+    query = urlencode(sorted(
+        (param, value)
+        for param, values in request.query_params.lists()
+        for value in values
+    ))
+    return f'{request.build_absolute_uri(request.path)}?{query}'
+
+
+def get_request_cache_key(request, version_key):
+    """Ключ ответа: штамп версии и нормализованный адрес запроса."""
+    digest = md5(
+        get_normalized_url(request).encode(), usedforsecurity=False
+    )
+    return f'{version_key}:{get_version(version_key)}:{digest.hexdigest()}'
@@ -0,0 +1,11 @@
+AUTOCOMPLETE_LIMIT = 10
+TITLES_CACHE_TIMEOUT = 60 * 15
+VERSION_STAMP_TIMEOUT = 60 * 60 * 24
+BULK_TITLES_LIMIT = 1000
+EXPORT_CHUNK_SIZE = 2000
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+GENRE_MODES = (
+    (GENRE_MODE_ANY, 'Любой из жанров'),
+    (GENRE_MODE_ALL, 'Все жанры'),
+)
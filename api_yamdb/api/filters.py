@@ -1,6 +1,11 @@
 import django_filters
+from django.db import connection
+from django.db.models import Count, F, Q
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
+from api.constants import GENRE_MODE_ALL, GENRE_MODES
 from reviews.models import Category, Genre, Title
+from reviews.search import build_search_query, is_search_supported
 
 
 class TitleFilter(django_filters.FilterSet):
@@ -10,7 +15,23 @@ class TitleFilter(django_filters.FilterSet):
     genre = django_filters.ModelMultipleChoiceFilter(
         field_name='genre__slug',
         to_field_name='slug',
-        queryset=Genre.objects.all()
+        queryset=Genre.objects.all(),
+        method='filter_genre'
+    )
+
+    # Диапазон лет выпуска
+    year_min = django_filters.NumberFilter(
+        field_name='year', lookup_expr='gte'
+    )
+    year_max = django_filters.NumberFilter(
+        field_name='year', lookup_expr='lte'
+    )
+
+    # Режим фильтрации по нескольким жанрам: любой или все сразу
+    genre_mode = django_filters.ChoiceFilter(
+        choices=GENRE_MODES,
+        empty_label=None,
+        method='filter_genre_mode'
     )
 
     # Поле фильтрации по категории с использованием slug
@@ -23,3 +44,51 @@ class TitleFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ('name', 'genre', 'category', 'year')
+
+    def filter_genre(self, queryset, name, genres):
+        """Фильтрует по жанрам подзапросом по таблице связей.
+
+        В отличие от JOIN, подзапрос не размножает строки произведений,
+        поэтому DISTINCT не нужен и COUNT пагинации остаётся верным.
+        """
+        if not genres:
+            return queryset
+        title_ids = Title.genre.through.objects.filter(
+            genre__in=genres
+        ).values('title_id')
+        if self.form.cleaned_data.get('genre_mode') == GENRE_MODE_ALL:
+            title_ids = title_ids.annotate(
+                genres_count=Count('genre_id')
+            ).filter(genres_count=len(set(genres))).values('title_id')
+        return queryset.filter(pk__in=title_ids)
+
+    def filter_genre_mode(self, queryset, name, value):
+        # Режим учитывается в filter_genre.
+        return queryset
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений по названию и описанию.
+
+    Без явного параметра ordering результаты сортируются
+    по релевантности. Если СУБД не поддерживает FTS5, выполняется
+    поиск подстроки.
+    """
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        query = build_search_query(text)
+        if not query:
+            return queryset
+        if not is_search_supported(connection):
+            return queryset.filter(
+                Q(name__icontains=text) | Q(description__icontains=text)
+            )
+        queryset = queryset.filter(
+            search__document__match=query
+        ).annotate(search_rank=F('search__rank'))
+        if OrderingFilter.ordering_param not in request.query_params:
+            queryset = queryset.order_by('search_rank')
+        return queryset
@@ -1,3 +1,18 @@
+from hashlib import md5
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from api.cache import (
+    get_normalized_url,
+    get_request_cache_key,
+    get_versions,
+    stamp_timestamp,
+)
+from api.pagination import KeysetPagination
 from users.validators import username_validator
 
 
@@ -10,3 +25,113 @@ class UsernameValidationMixin:
 
     def validate_username(self, username):
         return username_validator(username)
+
+
+class CursorPaginationMixin:
+    '''Миксин для ViewSet с курсорной пагинацией по запросу клиента.
+    По умолчанию используется обычная постраничная пагинация,
+    а параметр ?pagination=cursor включает KeysetPagination.
+    '''
+
+    pagination_query_param = 'pagination'
+    cursor_pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.request is not None:
+            mode = self.request.query_params.get(self.pagination_query_param)
+            if mode == 'cursor':
+                self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+class SparseFieldsMixin:
+    '''Миксин сериализатора для выборочного набора полей в ответе.
+    GET-параметры fields и omit перечисляют через запятую поля,
+    которые нужно оставить или исключить. Запросы на запись
+    всегда используют все поля сериализатора.
+    '''
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        fields = set(cls.Meta.fields)
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+        selected = request.query_params.get(cls.fields_query_param)
+        if selected is not None:
+            fields &= set(selected.split(','))
+        omitted = request.query_params.get(cls.omit_query_param)
+        if omitted is not None:
+            fields -= set(omitted.split(','))
+        return fields
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.get_requested_fields(self.context.get('request'))
+        return {
+            name: field for name, field in fields.items()
+            if name in requested
+        }
+
+
+class CachedListMixin:
+    '''Миксин для ViewSet с кэшированием ответов list.
+    Ключ строится по нормализованной строке запроса и штампу версии
+    list_cache_version_key, который сигналы меняют при записи.
+    '''
+
+    list_cache_version_key = None
+    list_cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        key = get_request_cache_key(request, self.list_cache_version_key)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, self.list_cache_timeout)
+        return response
+
+
+class ConditionalGetMixin:
+    '''Миксин для ViewSet с условными GET-запросами list и retrieve.
+    ETag и Last-Modified строятся по штампам версий из ключей, которые
+    возвращает обязательный метод ViewSet get_version_keys(), поэтому
+    ответ 304 отдаётся до выполнения запроса к БД и сериализации.
+    '''
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        stamps = get_versions(self.get_version_keys())
+        # Представление зависит и от формата ответа, и от параметров.
+        digest = md5(
+            '|'.join((
+                *stamps,
+                request.accepted_media_type,
+                get_normalized_url(request),
+            )).encode(),
+            usedforsecurity=False
+        )
+        etag = quote_etag(digest.hexdigest())
+        last_modified = max(stamp_timestamp(stamp) for stamp in stamps)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = handler(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,209 @@
+"""Классы пагинации для API сервиса YaMDB."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная (keyset) пагинация без COUNT(*) и OFFSET.
+
+    Курсор хранит значения всех полей сортировки крайнего объекта
+    страницы, а первичный ключ добавляется к сортировке как tiebreaker.
+    Соседняя страница выбирается условием по этим значениям, поэтому
+    её стоимость не зависит от глубины прокрутки.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.fields = self.get_ordering_fields(queryset)
+        self.nullable = {
+            name for name, field in self.fields.items()
+            if field is not None and field.null
+        }
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self.invert(field) for field in ordering]
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, position))
+        results = list(queryset.order_by(
+            *[self.order_expression(field) for field in ordering]
+        )[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {
+                    'type': 'string', 'nullable': True, 'format': 'uri'
+                },
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_ordering(self, queryset):
+        """Сортировка запроса с первичным ключом в качестве tiebreaker."""
+        ordering = list(
+            queryset.query.order_by or queryset.model._meta.ordering
+        )
+        pk_name = queryset.model._meta.pk.name
+        if not {field.lstrip('-') for field in ordering} & {pk_name, 'pk'}:
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append(f'-{pk_name}' if descending else pk_name)
+        return ordering
+
+    def get_ordering_fields(self, queryset):
+        """Поля модели или аннотации запроса для каждого поля сортировки."""
+        fields = {}
+        for field in self.ordering:
+            name = field.lstrip('-')
+            if name == 'pk':
+                fields[name] = queryset.model._meta.pk
+            elif name in queryset.query.annotations:
+                fields[name] = queryset.query.annotations[name].output_field
+            else:
+                try:
+                    fields[name] = queryset.model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    fields[name] = None
+        return fields
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def order_expression(self, field):
+        """Сортировка, в которой NULL меньше любого значения на любой СУБД."""
+        name = field.lstrip('-')
+        if name not in self.nullable:
+            return field
+        if field.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_first=True)
+
+    def after(self, field, value, inclusive=False):
+        """Условие «после value» по одному полю или None, если таких нет."""
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        if value is None:
+            if descending:
+                return Q(**{f'{name}__isnull': True}) if inclusive else None
+            return Q() if inclusive else Q(**{f'{name}__isnull': False})
+        lookup = 'lt' if descending else 'gt'
+        if inclusive:
+            lookup += 'e'
+        condition = Q(**{f'{name}__{lookup}': value})
+        if descending and name in self.nullable:
+            condition |= Q(**{f'{name}__isnull': True})
+        return condition
+
+    def seek_filter(self, ordering, position):
+        """Условие «строго после позиции» для составного ключа сортировки.
+
+        Дополнительное нестрогое условие по первому полю задаёт диапазон,
+        по которому СУБД может пройти индексом.
+        """
+        conditions = []
+        for index, field in enumerate(ordering):
+            condition = self.after(field, position[index])
+            if condition is None:
+                continue
+            for previous, value in zip(ordering[:index], position):
+                name = previous.lstrip('-')
+                condition &= (
+                    Q(**{f'{name}__isnull': True}) if value is None
+                    else Q(**{name: value})
+                )
+            conditions.append(condition)
+        start = self.after(ordering[0], position[0], inclusive=True)
+        if not conditions or start is None:
+            raise NotFound(self.invalid_cursor_message)
+        return start & reduce(or_, conditions)
+
+    def encode_cursor(self, instance, reverse):
+        position = [
+            getattr(instance, field.lstrip('-')) for field in self.ordering
+        ]
+        data = json.dumps({'p': position, 'r': int(reverse)}, default=str)
+        cursor = urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        """Возвращает позицию и направление курсора из запроса."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode()))
+            position, reverse = data['p'], bool(data['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                self.to_python(field.lstrip('-'), value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def to_python(self, name, value):
+        """Значение курсора, приведённое к типу поля сортировки."""
+        if value is None:
+            if name not in self.nullable:
+                raise ValueError(f'Поле {name} не может быть пустым.')
+            return None
+        field = self.fields[name]
+        return value if field is None else field.to_python(value)
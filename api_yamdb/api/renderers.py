@@ -0,0 +1,29 @@
+"""Рендереры ответов API сервиса YaMDB."""
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Ответ в формате NDJSON: один объект JSON на строку.
+
+    Потоковые выгрузки формируют строки сами, а рендерер нужен для
+    согласования формата и ответов с ошибками.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    @staticmethod
+    def render_line(data):
+        return json.dumps(
+            data, cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.render_line(data).encode(self.charset)
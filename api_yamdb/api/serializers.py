@@ -2,12 +2,22 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.db.models.signals import m2m_changed
 from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from rest_framework_simplejwt.tokens import AccessToken
 
-from api.mixins import UsernameValidationMixin
+from api.cache import TITLES_VERSION_KEY, bump_version
+from api.mixins import SparseFieldsMixin, UsernameValidationMixin
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import index_titles
 from users.constants import MAX_EMAIL_LENGTH, MAX_USERNAME_LENGTH
 
 User = get_user_model()
@@ -130,7 +140,16 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class AutocompleteSerializer(serializers.Serializer):
+    """Сериализатор подсказки для поиска по началу названия."""
+
+    type = serializers.CharField()
+    name = serializers.CharField()
+    id = serializers.IntegerField(required=False)
+    slug = serializers.SlugField(required=False)
+
+
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для чтения произведений."""
 
     genre = GenreSerializer(many=True)
@@ -154,15 +173,150 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
 
 
+class ScoreCountSerializer(serializers.Serializer):
+    """Сериализатор столбца гистограммы оценок произведения."""
+
+    score = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class PreloadedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объекты среди загруженных заранее.
+
+    Если в context['slug_objects'] есть словарь slug -> объект для модели
+    поля, значение берётся из него без запроса к БД. С many=True все
+    слаги списка разрешаются одним запросом.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return SlugManyRelatedField(**list_kwargs)
+
+    def get_preloaded_objects(self):
+        return self.context.get('slug_objects', {}).get(
+            self.get_queryset().model
+        )
+
+    def get_objects(self, slugs):
+        """Словарь slug -> объект для набора слагов."""
+        objects = self.get_preloaded_objects()
+        if objects is not None:
+            return objects
+        return self.get_queryset().in_bulk(
+            set(slugs), field_name=self.slug_field
+        )
+
+    def to_internal_value(self, data):
+        if self.get_preloaded_objects() is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail('invalid')
+        try:
+            return self.get_objects((data,))[data]
+        except KeyError:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+
+
+class SlugManyRelatedField(serializers.ManyRelatedField):
+    """Список слагов, разрешаемый одним запросом slug__in.
+
+    Все отсутствующие слаги перечисляются в одной ошибке.
+    """
+
+    default_error_messages = {
+        'does_not_exist': 'Не найдены объекты с {slug_name}: {values}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        slugs = list(data)
+        if not self.allow_empty and not slugs:
+            self.fail('empty')
+        if not all(isinstance(slug, str) for slug in slugs):
+            self.child_relation.fail('invalid')
+        objects = self.child_relation.get_objects(slugs)
+        missing = [
+            slug for slug in dict.fromkeys(slugs) if slug not in objects
+        ]
+        if missing:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.child_relation.slug_field,
+                values=', '.join(missing)
+            )
+        return [objects[slug] for slug in slugs]
+
+
+class TitleBulkSerializer(serializers.ListSerializer):
+    """Сериализатор для массового создания произведений.
+
+    Слаги жанров и категорий всех элементов разрешаются одним запросом
+    на модель, а произведения и их связи с жанрами создаются через
+    bulk_create в одной транзакции.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and (
+            self.max_length is None or len(data) <= self.max_length
+        ):
+            items = [item for item in data if isinstance(item, dict)]
+            genre_slugs = {
+                slug for item in items
+                if isinstance(item.get('genre'), list)
+                for slug in item['genre'] if isinstance(slug, str)
+            }
+            category_slugs = {
+                item['category'] for item in items
+                if isinstance(item.get('category'), str)
+            }
+            self.context['slug_objects'] = {
+                Genre: Genre.objects.in_bulk(genre_slugs, field_name='slug'),
+                Category: Category.objects.in_bulk(
+                    category_slugs, field_name='slug'
+                ),
+            }
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        genres = [
+            dict.fromkeys(item.pop('genre')) for item in validated_data
+        ]
+        titles = [Title(**item) for item in validated_data]
+        for title in titles:
+            title.fill_name_key()
+        genre_title = Title.genre.through
+        # bulk_create не вызывает сигналы моделей, поэтому поисковый
+        # индекс и версию кэша обновляем здесь же.
+        with transaction.atomic():
+            Title.objects.bulk_create(titles)
+            genre_title.objects.bulk_create(
+                genre_title(title=title, genre=genre)
+                for title, title_genres in zip(titles, genres)
+                for genre in title_genres
+            )
+            index_titles(titles)
+            bump_version(TITLES_VERSION_KEY)
+        return titles
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Сериализатор для создания/обновления произведений."""
 
-    genre = serializers.SlugRelatedField(
+    genre = PreloadedSlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True
     )
-    category = serializers.SlugRelatedField(
+    category = PreloadedSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -177,6 +331,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             'genre',
             'category'
         )
+        list_serializer_class = TitleBulkSerializer
 
     # Добавлена проверка принадлежности хотя бы к одному жанру
     def validate_genre(self, value):
@@ -186,17 +341,68 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             )
         return value
 
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if genres is not None:
+                self.update_genres(instance, genres)
+        return instance
+
+    @staticmethod
+    def update_genres(instance, genres):
+        """Меняет жанры произведения по разнице с текущим набором.
+
+        Выполняет не больше одного DELETE и одного INSERT по таблице
+        связей и ничего не пишет, если набор жанров не изменился.
+        Текущие жанры берутся из prefetch_related, если он был.
+        """
+        current = {genre.pk for genre in instance.genre.all()}
+        new = {genre.pk for genre in genres}
+        removed, added = current - new, new - current
+        if not removed and not added:
+            return
+        genre_title = Title.genre.through
+        signal_kwargs = {
+            'sender': genre_title,
+            'instance': instance,
+            'reverse': False,
+            'model': Genre,
+            'using': instance._state.db,
+        }
+        if removed:
+            m2m_changed.send(action='pre_remove', pk_set=removed,
+                             **signal_kwargs)
+            genre_title.objects.filter(
+                title=instance, genre_id__in=removed
+            ).delete()
+            m2m_changed.send(action='post_remove', pk_set=removed,
+                             **signal_kwargs)
+        if added:
+            m2m_changed.send(action='pre_add', pk_set=added, **signal_kwargs)
+            genre_title.objects.bulk_create(
+                genre_title(title=instance, genre_id=genre_id)
+                for genre_id in added
+            )
+            m2m_changed.send(action='post_add', pk_set=added, **signal_kwargs)
+        # Сбрасываем устаревший prefetch, чтобы ответ содержал новые жанры.
+        getattr(instance, '_prefetched_objects_cache', {}).pop('genre', None)
+
     def to_representation(self, instance):
         return TitleReadSerializer(instance, context=self.context).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для отзывов на произведения."""
 
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username'
     )
+    comments_count = serializers.IntegerField(
+        read_only=True,
+        help_text='Число комментариев к отзыву'
+    )
 
     class Meta:
         model = Review
@@ -205,29 +411,84 @@ class ReviewSerializer(serializers.ModelSerializer):
             'text',
             'author',
             'score',
-            'pub_date'
+            'pub_date',
+            'comments_count'
         )
         read_only_fields = ('title',)
 
-    def validate(self, data):
-        """
-        Проверяет, что пользователь не оставлял отзыв на это произведение.
-        """
-        request = self.context.get('request')
+    def create(self, validated_data):
+        """Создаёт отзыв, полагаясь на ограничение unique_review_per_author.
 
-        if request and request.method == 'POST':
-            if Review.objects.filter(
-                title=self.context.get('view').kwargs.get('title_id'),
-                author=request.user
+        Вместо проверки перед вставкой, которая проигрывает гонку
+        параллельным запросам, повторный отзыв ловится по IntegrityError
+        в точке сохранения и превращается в ошибку валидации.
+        """
+        try:
+            with transaction.atomic():
+                review = super().create(validated_data)
+            # У нового отзыва ещё нет комментариев.
+            review.comments_count = 0
+            return review
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=validated_data['title'],
+                author=validated_data['author']
             ).exists():
-                raise serializers.ValidationError({
-                    'detail': 'Вы уже оставляли отзыв на это произведение.'
-                })
+                raise
+        raise serializers.ValidationError({
+            'detail': 'Вы уже оставляли отзыв на это произведение.'
+        })
 
-        return data
+    def update(self, instance, validated_data):
+        """Сохраняет только переданные поля.
+
+        Правка текста не записывает оценку, поэтому не трогает агрегаты
+        оценок произведения.
+        """
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=validated_data)
+        return instance
+
+
+class TitleExpandedSerializer(TitleReadSerializer):
+    """Произведение с первой страницей отзывов (?expand=reviews).
+
+    Число отзывов берётся из счётчика произведения, а авторы и число
+    комментариев загружаются одним запросом вместе со страницей.
+    """
+
+    reviews = serializers.SerializerMethodField()
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('reviews',)
+
+    def get_reviews(self, title):
+        page_size = api_settings.PAGE_SIZE
+        reviews = title.reviews.select_related(
+            'author'
+        ).with_comments_count()[:page_size]
+        next_link = None
+        if title.reviews_count > page_size:
+            next_link = replace_query_param(
+                reverse(
+                    'api:reviews-list',
+                    kwargs={'title_id': title.pk},
+                    request=self.context.get('request')
+                ),
+                PageNumberPagination.page_query_param,
+                2
+            )
+        return {
+            'count': title.reviews_count,
+            'next': next_link,
+            'previous': None,
+            # Без запроса в контексте ?fields/?omit не урезают отзывы.
+            'results': ReviewSerializer(reviews, many=True).data,
+        }
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для комментариев к отзывам."""
 
     author = serializers.SlugRelatedField(
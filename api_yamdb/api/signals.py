@@ -0,0 +1,114 @@
+"""Сигналы для инвалидации кэша ответов и штампов версий API."""
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
+from django.db.models import QuerySet
+from django.dispatch import receiver
+
+from api.cache import (
+    TAXONOMY_VERSION_KEY,
+    TITLES_VERSION_KEY,
+    USERS_VERSION_KEY,
+    bump_version,
+    comments_version_key,
+    reviews_version_key,
+    title_version_key,
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    bump_version(TITLES_VERSION_KEY, title_version_key(instance.pk))
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_deleted_title(sender, instance, **kwargs):
+    """Вложенные списки удалённого произведения должны отдать 404."""
+    bump_version(
+        TITLES_VERSION_KEY,
+        title_version_key(instance.pk),
+        reviews_version_key(instance.pk)
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, reverse, pk_set, **kwargs):
+    if not kwargs['action'].startswith('post_'):
+        return
+    if not reverse:
+        bump_version(TITLES_VERSION_KEY, title_version_key(instance.pk))
+    else:
+        bump_version(TITLES_VERSION_KEY, *(
+            title_version_key(title_id) for title_id in pk_set or ()
+        ))
+
+
+@receiver(post_save, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    """Отзыв меняет рейтинг произведения и список его отзывов."""
+    bump_version(
+        TITLES_VERSION_KEY,
+        title_version_key(instance.title_id),
+        reviews_version_key(instance.title_id)
+    )
+
+
+@receiver(post_delete, sender=Review)
+def invalidate_deleted_review(sender, instance, **kwargs):
+    bump_version(
+        TITLES_VERSION_KEY,
+        title_version_key(instance.title_id),
+        reviews_version_key(instance.title_id),
+        comments_version_key(instance.pk)
+    )
+
+
+def get_comment_title_id(comment):
+    if Comment.review.is_cached(comment):
+        return comment.review.title_id
+    return Review.objects.filter(
+        pk=comment.review_id
+    ).values_list('title_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, origin=None, **kwargs):
+    """Комментарий меняет список комментариев и их число в отзывах
+    произведения (?expand=reviews)."""
+    keys = [comments_version_key(instance.review_id)]
+    origin_model = (
+        origin.model if isinstance(origin, QuerySet) else type(origin)
+    )
+    # При каскаде от отзыва или произведения их штампы меняются сами.
+    if origin_model not in (Review, Title):
+        keys.append(reviews_version_key(get_comment_title_id(instance)))
+    bump_version(*keys)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_taxonomy(sender, **kwargs):
+    """Жанры и категории вложены во все ответы о произведениях."""
+    bump_version(TITLES_VERSION_KEY, TAXONOMY_VERSION_KEY)
+
+
+@receiver(pre_save, sender=User)
+def invalidate_username(sender, instance, **kwargs):
+    """Логин автора выводится в отзывах и комментариях."""
+    if instance.pk is None:
+        return
+    if User.objects.filter(pk=instance.pk).exclude(
+        username=instance.username
+    ).exists():
+        bump_version(USERS_VERSION_KEY)
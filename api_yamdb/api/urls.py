@@ -8,6 +8,9 @@ from api.views import (
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    autocomplete,
+    export_comments,
+    export_reviews,
     get_token,
     signup
 )
@@ -36,6 +39,9 @@ v1_auth = [
 ]
 v1_patterns = [
     path('auth/', include(v1_auth)),
+    path('autocomplete/', autocomplete, name='autocomplete'),
+    path('export/reviews.ndjson', export_reviews, name='export_reviews'),
+    path('export/comments.ndjson', export_comments, name='export_comments'),
     path('', include(router_v1.urls)),
 ]
 
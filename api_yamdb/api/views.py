@@ -2,33 +2,78 @@
 Модуль с основными view функциями и классами ViewSets для API сервиса YaMDB.
 """
 
+from datetime import datetime, time
+
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action,
+    api_view,
+    permission_classes,
+    renderer_classes,
+)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import (
     AllowAny,
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
 )
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from reviews.models import Category, Genre, Title, Review
-
-from api.filters import TitleFilter
+from reviews.constants import MAX_SCORE, MIN_SCORE
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    ScoreCount,
+    Title,
+)
+from reviews.search import normalize_name, prefix_filter
+
+from api.cache import (
+    TAXONOMY_VERSION_KEY,
+    TITLES_VERSION_KEY,
+    USERS_VERSION_KEY,
+    comments_version_key,
+    get_request_cache_key,
+    reviews_version_key,
+    title_version_key,
+)
+from api.constants import (
+    AUTOCOMPLETE_LIMIT,
+    BULK_TITLES_LIMIT,
+    EXPORT_CHUNK_SIZE,
+    TITLES_CACHE_TIMEOUT,
+)
+from api.filters import TitleFilter, TitleSearchFilter
+from api.mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+)
 from api.permissions import (
     IsAdmin,
     IsAdminOrReadOnly,
     IsAuthorModeratorAdminOrReadOnly,
 )
+from api.renderers import NDJSONRenderer
 from api.serializers import (
+    AutocompleteSerializer,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
     ReviewSerializer,
+    ScoreCountSerializer,
     SignUpSerializer,
+    TitleExpandedSerializer,
     TitleReadSerializer,
     TitleWriteSerializer,
     TokenSerializer,
@@ -77,6 +122,111 @@ def get_token(request):
     return Response(serializer.save(), status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete(request):
+    """Подсказки по началу названия произведений, жанров и категорий.
+
+    Каждая модель отдаёт не больше AUTOCOMPLETE_LIMIT строк из диапазона
+    индекса по name_key, затем кандидаты объединяются: точные совпадения
+    идут первыми, остальные — по алфавиту ключа.
+    """
+    prefix = normalize_name(request.query_params.get('q', ''))
+    if not prefix:
+        return Response([])
+    candidates = []
+    for suggestion_type, model, identifier in (
+        ('title', Title, 'id'),
+        ('genre', Genre, 'slug'),
+        ('category', Category, 'slug'),
+    ):
+        rows = model.objects.filter(
+            **prefix_filter('name_key', prefix)
+        ).order_by('name_key').values(
+            'name', 'name_key', identifier
+        )[:AUTOCOMPLETE_LIMIT]
+        candidates.extend({'type': suggestion_type, **row} for row in rows)
+    candidates.sort(
+        key=lambda row: (row['name_key'] != prefix, row['name_key'])
+    )
+    serializer = AutocompleteSerializer(
+        candidates[:AUTOCOMPLETE_LIMIT], many=True
+    )
+    return Response(serializer.data)
+
+
+def parse_since(request):
+    """Нижняя граница даты публикации из параметра since или None."""
+    value = request.query_params.get('since')
+    if not value:
+        return None
+    try:
+        since = parse_datetime(value)
+        date = parse_date(value) if since is None else None
+    except ValueError:
+        # Формат верный, но такой даты нет: 2024-02-30 или 25:00.
+        since = date = None
+    if since is None:
+        if date is None:
+            raise ValidationError({
+                'since': 'Ожидается дата или дата и время в формате ISO 8601.'
+            })
+        since = datetime.combine(date, time.min)
+    return make_aware(since) if is_naive(since) else since
+
+
+def export_ndjson(request, queryset, fields, filename):
+    """Потоковая выгрузка строк queryset в формате NDJSON.
+
+    Строки читаются из БД частями по EXPORT_CHUNK_SIZE через values_list,
+    без создания объектов моделей, поэтому расход памяти не зависит
+    от размера таблицы.
+    """
+    since = parse_since(request)
+    if since is not None:
+        queryset = queryset.filter(pub_date__gte=since)
+    rows = queryset.order_by('pk').values_list(
+        *fields.values()
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    names = tuple(fields)
+    response = StreamingHttpResponse(
+        (NDJSONRenderer.render_line(dict(zip(names, row))) for row in rows),
+        content_type=NDJSONRenderer.media_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([NDJSONRenderer, JSONRenderer])
+def export_reviews(request):
+    """Выгрузка всех отзывов в NDJSON, ?since= ограничивает дату."""
+    return export_ndjson(request, Review.objects.all(), {
+        'id': 'id',
+        'title': 'title_id',
+        'author': 'author__username',
+        'text': 'text',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }, 'reviews.ndjson')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([NDJSONRenderer, JSONRenderer])
+def export_comments(request):
+    """Выгрузка всех комментариев в NDJSON, ?since= ограничивает дату."""
+    return export_ndjson(request, Comment.objects.all(), {
+        'id': 'id',
+        'title': 'review__title_id',
+        'review': 'review_id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }, 'comments.ndjson')
+
+
 class UserViewSet(viewsets.ModelViewSet):
     """ViewSet для управления пользователями."""
 
@@ -110,6 +260,26 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.save()
         return Response(serializer.data)
 
+    @action(
+        detail=False,
+        permission_classes=(IsAuthenticated,),
+        url_path='me/recommendations'
+    )
+    def recommendations(self, request):
+        """Рекомендации произведений текущему пользователю.
+
+        Список заранее вычисляет команда build_recommendations.
+        """
+        titles = Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre').filter(
+            recommendations__user=request.user
+        ).order_by('-recommendations__score', 'pk')
+        serializer = TitleReadSerializer(
+            titles, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
 
 class CategoryViewSet(AdminSlugSearchViewSet):
     """ViewSet для работы с категориями произведений."""
@@ -125,48 +295,190 @@ class GenreViewSet(AdminSlugSearchViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
+    CursorPaginationMixin,
+    viewsets.ModelViewSet
+):
     """ViewSet для работы с произведениями (фильмы, книги и др.)."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('-year')
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('-year')
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (
         DjangoFilterBackend,
-        OrderingFilter
+        OrderingFilter,
+        TitleSearchFilter
     )
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
-    ordering_fields = ('name', 'year',)
+    ordering_fields = ('name', 'year', 'rating')
     ordering = ('-year')
+    lookup_value_regex = r'\d+'
+    expand_query_param = 'expand'
+    list_cache_version_key = TITLES_VERSION_KEY
+    list_cache_timeout = TITLES_CACHE_TIMEOUT
+
+    def get_expand(self):
+        expand = self.request.query_params.get(self.expand_query_param, '')
+        return set(expand.split(',')) if self.action == 'retrieve' else set()
+
+    def get_version_keys(self):
+        if self.action == 'list':
+            return [TITLES_VERSION_KEY]
+        keys = [title_version_key(self.kwargs['pk']), TAXONOMY_VERSION_KEY]
+        if 'reviews' in self.get_expand():
+            keys += [reviews_version_key(self.kwargs['pk']), USERS_VERSION_KEY]
+        return keys
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve', 'similar'):
+            return queryset
+        # Не загружаем данные для полей, исключённых через ?fields/?omit.
+        fields = TitleReadSerializer.get_requested_fields(self.request)
+        if 'genre' not in fields:
+            queryset = queryset.prefetch_related(None)
+        if 'category' not in fields:
+            queryset = queryset.select_related(None)
+        if 'description' not in fields:
+            queryset = queryset.defer('description')
+        return queryset
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if 'reviews' in self.get_expand():
+            return TitleExpandedSerializer
+        if self.action in ('list', 'retrieve', 'similar'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(detail=False, methods=('post',), url_path='bulk')
+    def bulk(self, request):
+        """Массовое создание произведений списком объектов."""
+        serializer = self.get_serializer(
+            data=request.data, many=True, allow_empty=False,
+            max_length=BULK_TITLES_LIMIT
+        )
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        queryset = self.get_queryset().filter(
+            pk__in=[title.pk for title in titles]
+        )
+        return Response(
+            TitleReadSerializer(
+                queryset, many=True, context=self.get_serializer_context()
+            ).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, url_path='facets')
+    def facets(self, request):
+        """Число произведений по жанрам, категориям и десятилетиям.
+
+        Принимает те же параметры фильтрации, что и список произведений.
+        """
+        key = get_request_cache_key(request, TITLES_VERSION_KEY)
+        data = cache.get(key)
+        if data is None:
+            data = self.filter_queryset(Title.objects.all()).facets()
+            cache.set(key, data, TITLES_CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(detail=True, url_path='similar')
+    def similar(self, request, pk=None):
+        """Похожие произведения из таблицы, которую заполняет команда
+        build_similar_titles."""
+        titles = list(self.get_queryset().filter(
+            similar_for__title_id=pk
+        ).order_by('-similar_for__score', 'pk'))
+        if not titles and not Title.objects.filter(pk=pk).exists():
+            raise NotFound
+        return Response(self.get_serializer(titles, many=True).data)
+
+    @action(detail=True, url_path='rating-histogram')
+    def rating_histogram(self, request, pk=None):
+        """Число отзывов с каждой оценкой от MIN_SCORE до MAX_SCORE."""
+        counts = dict(ScoreCount.objects.filter(
+            title_id=pk
+        ).values_list('score', 'count'))
+        if not counts and not Title.objects.filter(pk=pk).exists():
+            raise NotFound
+        serializer = ScoreCountSerializer(
+            [
+                {'score': score, 'count': counts.get(score, 0)}
+                for score in range(MIN_SCORE, MAX_SCORE + 1)
+            ],
+            many=True
+        )
+        return Response(serializer.data)
+
+
+class BaseReviewCommentViewSet(
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    viewsets.ModelViewSet
+):
+    """Базовый ViewSet для отзывов и комментариев.
 
-class BaseReviewCommentViewSet(viewsets.ModelViewSet):
-    """Базовый ViewSet для отзывов и комментариев."""
+    Вложенный список фильтруется по id родителя из адреса без загрузки
+    самого родителя. Родитель загружается не больше раза за запрос:
+    при создании объекта и для ответа 404, если страница списка пуста.
+    parent_lookup_kwargs сопоставляет поля родителя с параметрами адреса.
+    """
 
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsAuthorModeratorAdminOrReadOnly
     )
     http_method_names = ('get', 'post', 'patch', 'delete')
+    parent_model = None
+    parent_lookup_kwargs = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(self.parent_model, **{
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookup_kwargs.items()
+            })
+        return self._parent
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            # Пустой список - единственный случай, когда не ясно,
+            # существует ли родитель.
+            self.get_parent()
+        return page
 
 
 class ReviewViewSet(BaseReviewCommentViewSet):
     """ViewSet для работы с отзывами на произведения."""
 
     serializer_class = ReviewSerializer
+    parent_model = Title
+    parent_lookup_kwargs = {'pk': 'title_id'}
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        return self.get_parent()
+
+    def get_version_keys(self):
+        return [
+            reviews_version_key(self.kwargs.get('title_id')),
+            USERS_VERSION_KEY
+        ]
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        queryset = Review.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).select_related('author')
+        fields = ReviewSerializer.get_requested_fields(self.request)
+        if 'comments_count' in fields:
+            queryset = queryset.with_comments_count()
+        if 'text' not in fields:
+            queryset = queryset.defer('text')
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.get_title())
@@ -176,16 +488,26 @@ class CommentViewSet(BaseReviewCommentViewSet):
     """ViewSet для работы с комментариями к отзывам."""
 
     serializer_class = CommentSerializer
+    parent_model = Review
+    parent_lookup_kwargs = {'pk': 'review_id', 'title_id': 'title_id'}
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            title_id=self.kwargs.get('title_id'),
-            id=self.kwargs.get('review_id')
-        )
+        return self.get_parent()
+
+    def get_version_keys(self):
+        return [
+            comments_version_key(self.kwargs.get('review_id')),
+            USERS_VERSION_KEY
+        ]
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        queryset = Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id')
+        ).select_related('author')
+        if 'text' not in CommentSerializer.get_requested_fields(self.request):
+            queryset = queryset.defer('text')
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(
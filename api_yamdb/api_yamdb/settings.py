@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -59,13 +60,39 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
+# BEGIN IMMEDIATE сразу берёт блокировку записи: SQLite не знает
+# SELECT FOR UPDATE, а дельты агрегатов оценок читают сохранённую
+# оценку отзыва до записи.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
     }
 }
 
+# LocMemCache у каждого процесса свой: штамп версии, поднятый в одном
+# процессе, не виден остальным, и они отдают устаревшие страницы и ETag.
+# Поэтому без REDIS_URL сервер рассчитан на один процесс. Штампы версий
+# лежат в отдельном кэше, чтобы вытеснение страниц их не сбрасывало.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'versions',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+if os.getenv('REDIS_URL'):
+    for alias in CACHES:
+        CACHES[alias] = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+            'KEY_PREFIX': alias,
+        }
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
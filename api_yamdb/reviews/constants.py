@@ -3,3 +3,13 @@ MAX_SLUG_LENGHT = 50
 MAX_LINE_LENGTH = 20
 MIN_SCORE = 1
 MAX_SCORE = 10
+DECADE_LENGTH = 10
+SIMILAR_TITLES_LIMIT = 10
+# Доля сходства, которую даёт совпадение категории; остальное - жанры.
+SIMILAR_CATEGORY_WEIGHT = 0.2
+RECOMMENDATIONS_LIMIT = 20
+RECOMMENDATION_CANDIDATES = 1000
+RECOMMENDATION_FACTORS = 16
+RECOMMENDATION_EPOCHS = 20
+RECOMMENDATION_LEARNING_RATE = 0.01
+RECOMMENDATION_REGULARIZATION = 0.05
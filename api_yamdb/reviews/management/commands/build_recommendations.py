@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import (
+    RECOMMENDATION_EPOCHS,
+    RECOMMENDATION_FACTORS,
+    RECOMMENDATIONS_LIMIT,
+)
+from reviews.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт рекомендаций произведений по оценкам из отзывов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--epochs',
+            type=int,
+            default=RECOMMENDATION_EPOCHS,
+            help='Число проходов по отзывам при обучении'
+        )
+        parser.add_argument(
+            '--factors',
+            type=int,
+            default=RECOMMENDATION_FACTORS,
+            help='Число скрытых факторов'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=RECOMMENDATIONS_LIMIT,
+            help='Число рекомендаций для каждого пользователя'
+        )
+
+    def handle(self, *args, **options):
+        model = build_recommendations(
+            epochs=options['epochs'],
+            factors=options['factors'],
+            limit=options['limit']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Рекомендации пересчитаны для '
+            f'{len(model.user_vectors)} пользователей'
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import SIMILAR_TITLES_LIMIT
+from reviews.similarity import build_similar_titles
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчёт похожих произведений для произведений, у которых '
+        'изменились жанры или категория'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать соседей всего каталога'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=SIMILAR_TITLES_LIMIT,
+            help='Число соседей у каждого произведения'
+        )
+
+    def handle(self, *args, **options):
+        count = build_similar_titles(
+            full=options['full'], limit=options['limit']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Похожие произведения пересчитаны для {count} произведений'
+        ))
@@ -4,7 +4,10 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 
-from reviews.models import Category, Genre, Title, Review, Comment
+from reviews.models import (
+    Category, Comment, Genre, NamedAbstract, Review, Title
+)
+from reviews.search import rebuild_search_index
 
 User = get_user_model()
 GenreTitle = Title.genre.through
@@ -95,7 +98,10 @@ class Command(BaseCommand):
                     fields = {}
                     for field, column in config['fields'].items():
                         fields[field] = row[column]
-                    objects_to_create.append(model(**fields))
+                    obj = model(**fields)
+                    if isinstance(obj, NamedAbstract):
+                        obj.fill_name_key()
+                    objects_to_create.append(obj)
 
             if objects_to_create:
                 model.objects.bulk_create(objects_to_create)
@@ -105,3 +111,8 @@ class Command(BaseCommand):
                         f'{model.__name__} записей'
                     )
                 )
+
+        # bulk_create не вызывает сигналы, поэтому агрегаты и поисковый
+        # индекс обновляем отдельно.
+        Title.objects.recalculate_scores()
+        rebuild_search_index()
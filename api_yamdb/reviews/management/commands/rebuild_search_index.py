@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.search import is_search_supported, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестроение полнотекстового индекса произведений'
+
+    def handle(self, *args, **options):
+        if not is_search_supported():
+            raise CommandError(
+                'Полнотекстовый поиск поддерживается только на SQLite.'
+            )
+        rebuild_search_index()
+        self.stdout.write(
+            self.style.SUCCESS('Поисковый индекс произведений перестроен')
+        )
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCount = apps.get_model('reviews', 'ScoreCount')
+    ScoreCount.objects.bulk_create(
+        ScoreCount(
+            title_id=row['title'], score=row['score'], count=row['total']
+        )
+        for row in Review.objects.order_by().values(
+            'title', 'score'
+        ).annotate(total=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Количество оценок',
+                'verbose_name_plural': 'Количество оценок',
+                'default_related_name': 'score_counts',
+                'constraints': [models.UniqueConstraint(fields=('title', 'score'), name='unique_score_count_per_title')],
+            },
+        ),
+        migrations.RunPython(
+            fill_score_counts, migrations.RunPython.noop
+        ),
+    ]
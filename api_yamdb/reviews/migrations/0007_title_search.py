@@ -0,0 +1,42 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:40
+
+import django.db.models.deletion
+import reviews.search
+from django.db import migrations, models
+
+from reviews.search import create_search_index, drop_search_index
+
+
+def create_index(apps, schema_editor):
+    create_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_scorecount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearch',
+            fields=[
+                ('title', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('name', models.TextField(verbose_name='Название')),
+                ('description', models.TextField(null=True, verbose_name='Описание')),
+                ('document', reviews.search.SearchDocumentField(db_column='reviews_title_fts')),
+                ('rank', models.FloatField(verbose_name='Релевантность')),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс произведения',
+                'verbose_name_plural': 'Поисковый индекс произведений',
+                'db_table': 'reviews_title_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
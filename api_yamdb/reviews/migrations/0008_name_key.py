@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:44
+
+from django.db import migrations, models
+
+from reviews.search import normalize_name
+
+
+def fill_name_keys(apps, schema_editor):
+    for model_name in ('Category', 'Genre', 'Title'):
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('name'))
+        for obj in objects:
+            obj.name_key = normalize_name(obj.name)
+        model.objects.bulk_update(objects, ('name_key',), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Ключ названия для поиска'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Ключ названия для поиска'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Ключ названия для поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_category_year_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='similar_outdated',
+            field=models.BooleanField(db_index=True, default=True, editable=False, verbose_name='Похожие произведения устарели'),
+        ),
+        migrations.CreateModel(
+            name='SimilarTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Сходство')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_for', to='reviews.title', verbose_name='Похожее произведение')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_titles', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Похожее произведение',
+                'verbose_name_plural': 'Похожие произведения',
+                'indexes': [models.Index(fields=['title', '-score'], name='similar_title_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('title', 'similar'), name='unique_similar_title')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='similar_outdated',
+            field=models.PositiveIntegerField(db_index=True, default=1, editable=False, verbose_name='Изменений с пересчёта похожих произведений'),
+        ),
+    ]
@@ -2,16 +2,20 @@
 
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Floor, NullIf
 from django.utils.timezone import now
 
 from reviews.constants import (
+    DECADE_LENGTH,
     MAX_LINE_LENGTH,
     MAX_NAME_LENGTH,
     MAX_SLUG_LENGHT,
     MIN_SCORE,
     MAX_SCORE
 )
+from reviews.search import SEARCH_TABLE, SearchDocumentField, normalize_name
 
 User = get_user_model()
 
@@ -20,6 +24,14 @@ def get_current_year():
     return now().year
 
 
+def rating_expression(score_sum, reviews_count):
+    """Выражение среднего рейтинга; NULL, если отзывов нет."""
+    return (
+        Cast(score_sum, models.FloatField())
+        / NullIf(reviews_count, 0)
+    )
+
+
 class NamedAbstract(models.Model):
     """Абстрактная модель с полем name.
     Подходит для любых моделей, где необходимо уникальное наименование.
@@ -29,6 +41,12 @@ class NamedAbstract(models.Model):
         verbose_name='Название',
         max_length=MAX_NAME_LENGTH
     )
+    name_key = models.CharField(
+        verbose_name='Ключ названия для поиска',
+        max_length=MAX_NAME_LENGTH,
+        db_index=True,
+        editable=False
+    )
 
     class Meta:
         abstract = True
@@ -37,6 +55,16 @@ class NamedAbstract(models.Model):
     def __str__(self):
         return self.name[:MAX_LINE_LENGTH]
 
+    def fill_name_key(self):
+        self.name_key = normalize_name(self.name)
+
+    def save(self, *args, **kwargs):
+        self.fill_name_key()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_key'}
+        super().save(*args, **kwargs)
+
 
 class SlugAbstract(NamedAbstract):
     """Абстрактная модель для категорий и жанров.
@@ -97,6 +125,70 @@ class Genre(SlugAbstract):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений с пересчётом агрегатов оценок."""
+
+    def recalculate_scores(self):
+        """Заново считает агрегаты оценок по таблице отзывов.
+
+        Нужен после массовых операций, которые обходят сигналы моделей
+        (например, bulk_create в load_data).
+        """
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        ScoreCount.objects.filter(title__in=self).delete()
+        ScoreCount.objects.bulk_create(
+            ScoreCount(
+                title_id=row['title'], score=row['score'], count=row['total']
+            )
+            for row in Review.objects.filter(title__in=self).order_by(
+            ).values('title', 'score').annotate(total=Count('pk'))
+        )
+        self.update(
+            score_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            reviews_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+        )
+        return self.update(
+            rating=rating_expression(F('score_sum'), F('reviews_count'))
+        )
+
+    def facets(self):
+        """Число произведений по жанрам, категориям и десятилетиям.
+
+        Каждый срез считается одним сгруппированным запросом по id
+        произведений из self, поэтому JOIN фильтров не влияет на счётчики.
+        """
+        titles = self.model.objects.filter(
+            pk__in=self.order_by().values('pk')
+        ).order_by()
+        genres = Genre.objects.filter(titles__in=titles).values(
+            'slug', 'name'
+        ).annotate(count=Count('titles')).order_by('-count', 'name')
+        categories = Category.objects.filter(titles__in=titles).values(
+            'slug', 'name'
+        ).annotate(count=Count('titles')).order_by('-count', 'name')
+        # Деление целых в SQL округляет к нулю, и -5 попал бы
+        # в десятилетие 0, поэтому год делится с округлением вниз.
+        decades = titles.values(decade=Cast(
+            Floor(Cast('year', models.FloatField()) / DECADE_LENGTH)
+            * DECADE_LENGTH,
+            models.IntegerField()
+        )).annotate(count=Count('pk')).order_by('decade')
+        return {
+            'count': titles.count(),
+            'genre': list(genres),
+            'category': list(categories),
+            'decade': list(decades),
+        }
+
+
 class Title(NamedAbstract):
     """Модель произведения (фильмы, книги и др.)."""
 
@@ -118,12 +210,73 @@ class Title(NamedAbstract):
         null=True,
         blank=True
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+    similar_outdated = models.PositiveIntegerField(
+        verbose_name='Изменений с пересчёта похожих произведений',
+        default=1,
+        editable=False,
+        db_index=True
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
         ordering = ('-year',)
+        indexes = (
+            models.Index(fields=('year', 'id'), name='title_year_id_idx'),
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+            models.Index(
+                fields=('category', 'rating'),
+                name='title_category_rating_idx'
+            ),
+            models.Index(
+                fields=('category', 'year', 'id'),
+                name='title_category_year_id_idx'
+            ),
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Смена категории делает устаревшим список похожих произведений.
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+        return instance
+
+
+class ReviewQuerySet(models.QuerySet):
+    """QuerySet отзывов с числом комментариев."""
+
+    def with_comments_count(self):
+        """Добавляет comments_count коррелированным подзапросом.
+
+        В отличие от JOIN с GROUP BY, подзапрос проходит по индексу
+        комментариев и не отменяет сортировку отзывов по умолчанию.
+        """
+        comments = Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review').annotate(total=Count('pk'))
+        return self.annotate(comments_count=Coalesce(
+            Subquery(comments.values('total')), 0
+        ))
 
 
 class Review(UserTextPubDateAbstract):
@@ -148,6 +301,8 @@ class Review(UserTextPubDateAbstract):
         help_text='Введите оценку от 1 до 10'
     )
 
+    objects = ReviewQuerySet.as_manager()
+
     class Meta(UserTextPubDateAbstract.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
@@ -158,6 +313,17 @@ class Review(UserTextPubDateAbstract):
                 name='unique_review_per_author'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        # Агрегаты произведения обновляются в post_save той же транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Comment(UserTextPubDateAbstract):
@@ -173,3 +339,142 @@ class Comment(UserTextPubDateAbstract):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
+
+
+class ScoreCount(models.Model):
+    """Число отзывов с данной оценкой для гистограммы произведения."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(verbose_name='Оценка')
+    count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Количество оценок'
+        verbose_name_plural = 'Количество оценок'
+        default_related_name = 'score_counts'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='unique_score_count_per_title'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.score}: {self.count}'
+
+
+class SimilarTitle(models.Model):
+    """Заранее вычисленный похожий на произведение сосед.
+
+    Таблицу заполняет команда build_similar_titles.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_titles',
+        verbose_name='Произведение'
+    )
+    similar = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='similar_for',
+        verbose_name='Похожее произведение'
+    )
+    score = models.FloatField(verbose_name='Сходство')
+
+    class Meta:
+        verbose_name = 'Похожее произведение'
+        verbose_name_plural = 'Похожие произведения'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'similar'),
+                name='unique_similar_title'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('title', '-score'), name='similar_title_score_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id} ~ {self.similar_id}: {self.score:.2f}'
+
+
+class Recommendation(models.Model):
+    """Рекомендованное пользователю произведение с прогнозом оценки.
+
+    Таблицу заполняет команда build_recommendations.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение'
+    )
+    score = models.FloatField(verbose_name='Прогноз оценки')
+
+    class Meta:
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+        default_related_name = 'recommendations'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'title'),
+                name='unique_recommendation'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-score'), name='recommendation_score_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.title_id}: {self.score:.2f}'
+
+
+class TitleSearch(models.Model):
+    """Строка полнотекстового индекса произведения.
+
+    Таблица FTS5 создаётся миграцией и заполняется функциями
+    из reviews.search, поэтому модель используется только для чтения.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search',
+        verbose_name='Произведение'
+    )
+    name = models.TextField(verbose_name='Название')
+    description = models.TextField(verbose_name='Описание', null=True)
+    document = SearchDocumentField(db_column=SEARCH_TABLE)
+    rank = models.FloatField(verbose_name='Релевантность')
+
+    class Meta:
+        managed = False
+        db_table = SEARCH_TABLE
+        verbose_name = 'Поисковый индекс произведения'
+        verbose_name_plural = 'Поисковый индекс произведений'
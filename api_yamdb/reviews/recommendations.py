@@ -0,0 +1,164 @@
+"""Рекомендации произведений по оценкам из отзывов.
+
+Матрица пользователь x произведение с оценками из отзывов раскладывается
+на скрытые факторы стохастическим градиентным спуском (SVD Функа):
+оценка приближается суммой средней оценки, смещений пользователя и
+произведения и скалярного произведения их векторов факторов. Отзывы
+читаются из БД частями на каждой эпохе, поэтому в памяти хранятся
+только векторы факторов, а не сама матрица.
+"""
+
+from heapq import nlargest
+from itertools import groupby
+from random import Random
+
+from django.db import transaction
+from django.db.models import Avg, Exists, OuterRef
+
+from reviews.constants import (
+    RECOMMENDATION_CANDIDATES,
+    RECOMMENDATION_EPOCHS,
+    RECOMMENDATION_FACTORS,
+    RECOMMENDATION_LEARNING_RATE,
+    RECOMMENDATION_REGULARIZATION,
+    RECOMMENDATIONS_LIMIT,
+)
+from reviews.models import Recommendation, Review, Title
+
+CHUNK_SIZE = 5000
+USERS_BATCH_SIZE = 500
+
+
+class Factorization:
+    """Смещения и векторы факторов пользователей и произведений."""
+
+    def __init__(self, factors=RECOMMENDATION_FACTORS, seed=0):
+        self.factors = factors
+        self.random = Random(seed)
+        self.mean = 0
+        self.user_bias = {}
+        self.title_bias = {}
+        self.user_vectors = {}
+        self.title_vectors = {}
+
+    def vector(self, vectors, key):
+        if key not in vectors:
+            vectors[key] = [
+                self.random.gauss(0, 0.1) for _ in range(self.factors)
+            ]
+        return vectors[key]
+
+    def fit(self, ratings, epochs=RECOMMENDATION_EPOCHS,
+            learning_rate=RECOMMENDATION_LEARNING_RATE,
+            regularization=RECOMMENDATION_REGULARIZATION):
+        """Обучает модель; ratings() возвращает новый поток троек
+        (пользователь, произведение, оценка) для каждой эпохи."""
+        for _ in range(epochs):
+            for user_id, title_id, score in ratings():
+                user = self.vector(self.user_vectors, user_id)
+                title = self.vector(self.title_vectors, title_id)
+                user_bias = self.user_bias.get(user_id, 0)
+                title_bias = self.title_bias.get(title_id, 0)
+                error = score - (
+                    self.mean + user_bias + title_bias
+                    + sum(map(float.__mul__, user, title))
+                )
+                self.user_bias[user_id] = user_bias + learning_rate * (
+                    error - regularization * user_bias
+                )
+                self.title_bias[title_id] = title_bias + learning_rate * (
+                    error - regularization * title_bias
+                )
+                for index in range(self.factors):
+                    user_factor, title_factor = user[index], title[index]
+                    user[index] += learning_rate * (
+                        error * title_factor - regularization * user_factor
+                    )
+                    title[index] += learning_rate * (
+                        error * user_factor - regularization * title_factor
+                    )
+
+    def predict(self, user_id, title_id):
+        return (
+            self.mean
+            + self.user_bias[user_id]
+            + self.title_bias[title_id]
+            + sum(map(
+                float.__mul__,
+                self.user_vectors[user_id],
+                self.title_vectors[title_id]
+            ))
+        )
+
+    def recommend(self, user_id, candidates, seen,
+                  limit=RECOMMENDATIONS_LIMIT):
+        """Пары (прогноз, id) лучших непросмотренных произведений."""
+        if user_id not in self.user_vectors:
+            return []
+        return nlargest(
+            limit,
+            (
+                (self.predict(user_id, title_id), title_id)
+                for title_id in candidates if title_id not in seen
+            ),
+            key=lambda pair: (pair[0], -pair[1])
+        )
+
+
+def stream_ratings():
+    return Review.objects.order_by('pk').values_list(
+        'author_id', 'title_id', 'score'
+    ).iterator(chunk_size=CHUNK_SIZE)
+
+
+def stream_user_titles():
+    """Произведения, оценённые каждым пользователем, по одному за раз."""
+    rows = Review.objects.order_by('author_id').values_list(
+        'author_id', 'title_id'
+    ).iterator(chunk_size=CHUNK_SIZE)
+    for user_id, group in groupby(rows, key=lambda row: row[0]):
+        yield user_id, {title_id for _, title_id in group}
+
+
+def save_recommendations(model, candidates, limit):
+    users = stream_user_titles()
+    while batch := [user for _, user in zip(range(USERS_BATCH_SIZE), users)]:
+        with transaction.atomic():
+            Recommendation.objects.filter(
+                user_id__in=[user_id for user_id, _ in batch]
+            ).delete()
+            Recommendation.objects.bulk_create(
+                Recommendation(user_id=user_id, title_id=title_id, score=score)
+                for user_id, seen in batch
+                for score, title_id in model.recommend(
+                    user_id, candidates, seen, limit
+                )
+            )
+    # Пользователи без отзывов больше не получают рекомендаций.
+    Recommendation.objects.exclude(Exists(
+        Review.objects.filter(author=OuterRef('user'))
+    )).delete()
+
+
+def build_recommendations(epochs=RECOMMENDATION_EPOCHS,
+                          factors=RECOMMENDATION_FACTORS,
+                          limit=RECOMMENDATIONS_LIMIT, seed=0):
+    """Обучает модель по всем отзывам и сохраняет рекомендации.
+
+    Кандидатами служат RECOMMENDATION_CANDIDATES произведений с наибольшим
+    числом отзывов: у редко оцениваемых векторы факторов ненадёжны.
+    Возвращает обученную модель.
+    """
+    model = Factorization(factors=factors, seed=seed)
+    model.mean = Review.objects.aggregate(mean=Avg('score'))['mean'] or 0
+    model.fit(stream_ratings, epochs=epochs)
+    candidates = [
+        title_id for title_id in Title.objects.filter(
+            reviews_count__gt=0
+        ).order_by('-reviews_count', 'pk').values_list(
+            'pk', flat=True
+        )[:RECOMMENDATION_CANDIDATES]
+        if title_id in model.title_vectors
+    ]
+    save_recommendations(model, candidates, limit)
+    return model
@@ -0,0 +1,125 @@
+"""Поиск по произведениям, жанрам и категориям.
+
+Полнотекстовый индекс хранится в виртуальной таблице FTS5 SEARCH_TABLE
+со своей копией названия и описания: rowid строки равен id произведения.
+На других СУБД таблица не создаётся и поиск не поддерживается.
+Для поиска по началу названия используется нормализованный ключ имени.
+"""
+
+import re
+
+from django.db import connection, models
+
+SEARCH_TABLE = 'reviews_title_fts'
+# Название весит в ранжировании bm25 больше описания.
+SEARCH_RANK = 'bm25(10.0, 1.0)'
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+# Верхняя граница диапазона ключей с общим префиксом.
+PREFIX_RANGE_END = '\U0010ffff'
+
+
+class SearchDocumentField(models.TextField):
+    """Скрытый столбец FTS5 с именем таблицы, по которому идёт MATCH."""
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+def is_search_supported(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def create_search_index(using=connection):
+    """Создаёт виртуальную таблицу FTS5 и заполняет её."""
+    if not is_search_supported(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+            "name, description, tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES '
+            f"('rank', '{SEARCH_RANK}')"
+        )
+    rebuild_search_index(using)
+
+
+def drop_search_index(using=connection):
+    if not is_search_supported(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
+
+
+def rebuild_search_index(using=connection):
+    """Полностью перестраивает индекс по таблице произведений."""
+    if not is_search_supported(using):
+        return
+    with using.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE}(rowid, name, description) '
+            'SELECT id, name, description FROM reviews_title'
+        )
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"
+        )
+
+
+def index_titles(titles):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT OR REPLACE INTO {SEARCH_TABLE}(rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [(title.pk, title.name, title.description) for title in titles]
+        )
+
+
+def index_title(title):
+    index_titles((title,))
+
+
+def unindex_title(title_id):
+    if not is_search_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', (title_id,)
+        )
+
+
+def build_search_query(text):
+    """Превращает ввод пользователя в безопасный запрос FTS5.
+
+    Каждое слово ищется как префикс, все слова должны присутствовать.
+    Возвращает пустую строку, если в тексте нет слов.
+    """
+    return ' '.join(
+        f'"{token}"*' for token in SEARCH_TOKEN_PATTERN.findall(text)
+    )
+
+
+def normalize_name(name):
+    """Ключ имени для поиска по префиксу: регистр, «ё» и пробелы."""
+    return ' '.join(name.casefold().replace('ё', 'е').split())
+
+
+def prefix_filter(field_name, prefix):
+    """Условие диапазона ключей с данным префиксом.
+
+    В отличие от LIKE, диапазон всегда проходится по индексу.
+    """
+    return {
+        f'{field_name}__gte': prefix,
+        f'{field_name}__lt': prefix + PREFIX_RANGE_END,
+    }
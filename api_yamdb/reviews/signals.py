@@ -0,0 +1,170 @@
+"""Сигналы для поддержания агрегатов оценок, поискового индекса
+и флагов устаревших похожих произведений."""
+
+from django.db.models import F, QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    Genre,
+    Review,
+    ScoreCount,
+    Title,
+    rating_expression,
+)
+from reviews.search import index_title, unindex_title
+
+
+def update_title_scores(title_id, score_delta, count_delta=0):
+    """Сдвигает сумму оценок и число отзывов произведения на дельту.
+
+    Рейтинг пересчитывается в том же UPDATE из прежних значений столбцов.
+    """
+    if not score_delta and not count_delta:
+        return
+    score_sum = F('score_sum') + score_delta
+    reviews_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=rating_expression(score_sum, reviews_count)
+    )
+
+
+def update_score_count(title_id, score, delta):
+    """Сдвигает счётчик оценки в гистограмме произведения на дельту."""
+    counts = ScoreCount.objects.filter(title_id=title_id, score=score)
+    if counts.update(count=F('count') + delta) or delta < 0:
+        return
+    # Строки счётчика ещё нет: создаём её без гонки и повторяем сдвиг.
+    ScoreCount.objects.bulk_create(
+        (ScoreCount(title_id=title_id, score=score),),
+        ignore_conflicts=True
+    )
+    counts.update(count=F('count') + delta)
+
+
+def stored_score(review):
+    """Оценка из строки отзыва в БД, заблокированной до конца транзакции.
+
+    Дельты агрегатов считаются от неё, а не от оценки, загруженной
+    в экземпляр: устаревшая копия отзыва или повторное удаление иначе
+    сдвинули бы агрегаты дважды. None - строки отзыва уже нет.
+    SQLite не поддерживает SELECT FOR UPDATE, но транзакции на нём
+    начинаются с BEGIN IMMEDIATE (см. DATABASES), и пишущие транзакции
+    всё равно выполняются по очереди.
+    """
+    return Review.objects.select_for_update().filter(
+        pk=review.pk
+    ).values_list('score', flat=True).first()
+
+
+def deleted_with_title(origin):
+    """Удаление началось с произведения, и его агрегаты не нужны."""
+    origin_model = (
+        origin.model if isinstance(origin, QuerySet) else type(origin)
+    )
+    return origin_model is Title
+
+
+@receiver(pre_save, sender=Review)
+def review_saving(sender, instance, update_fields=None, **kwargs):
+    """Запоминает сохранённую оценку изменяемого отзыва."""
+    instance._stored_score = None
+    if instance._state.adding or (
+        update_fields is not None and 'score' not in update_fields
+    ):
+        return
+    instance._stored_score = stored_score(instance)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Учитывает новый отзыв или изменение оценки в агрегатах."""
+    if created:
+        update_title_scores(instance.title_id, instance.score, 1)
+        update_score_count(instance.title_id, instance.score, 1)
+    elif instance._stored_score not in (None, instance.score):
+        update_title_scores(
+            instance.title_id, instance.score - instance._stored_score
+        )
+        update_score_count(instance.title_id, instance._stored_score, -1)
+        update_score_count(instance.title_id, instance.score, 1)
+
+
+@receiver(pre_delete, sender=Review)
+def review_deleting(sender, instance, origin=None, **kwargs):
+    """Запоминает оценку удаляемого отзыва, если его строка ещё есть."""
+    instance._stored_score = (
+        None if deleted_with_title(origin) else stored_score(instance)
+    )
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключает удалённый отзыв из агрегатов, в том числе при каскаде."""
+    if instance._stored_score is None:
+        return
+    update_title_scores(instance.title_id, -instance._stored_score, -1)
+    update_score_count(instance.title_id, instance._stored_score, -1)
+
+
+def mark_similar_outdated(titles):
+    """Отмечает произведения для пересчёта похожих произведений.
+
+    Счётчик, а не флаг: пересчёт обнуляет только те счётчики, которые
+    не менялись с начала его работы.
+    """
+    titles.update(similar_outdated=F('similar_outdated') + 1)
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Обновляет строку поискового индекса при изменении текста."""
+    if update_fields is None or {'name', 'description'} & set(update_fields):
+        index_title(instance)
+    loaded_category_id = getattr(
+        instance, '_loaded_category_id', instance.category_id
+    )
+    if not created and loaded_category_id != instance.category_id:
+        mark_similar_outdated(Title.objects.filter(pk=instance.pk))
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleting(sender, instance, **kwargs):
+    """Произведения, где удаляемое было соседом, пересчитываются."""
+    mark_similar_outdated(
+        Title.objects.filter(similar_titles__similar=instance)
+    )
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    unindex_title(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action == 'pre_clear' and reverse:
+        mark_similar_outdated(Title.objects.filter(genre=instance))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            mark_similar_outdated(Title.objects.filter(pk=instance.pk))
+        elif pk_set:
+            mark_similar_outdated(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Category)
+def taxonomy_deleting(sender, instance, **kwargs):
+    """Удаление жанра или категории меняет их произведения без сигналов."""
+    mark_similar_outdated(instance.titles.all())
@@ -0,0 +1,162 @@
+"""Похожие произведения по набору жанров и категории.
+
+Набор жанров произведения хранится битовой маской в целом числе:
+пересечение и объединение наборов - это побитовые & и |, а их размер -
+число единичных битов. Кандидаты в соседи берутся из инвертированного
+индекса жанр -> произведения, поэтому произведение сравнивается только
+с теми, у кого есть общий жанр.
+"""
+
+from heapq import nlargest
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, Min
+
+from reviews.constants import SIMILAR_CATEGORY_WEIGHT, SIMILAR_TITLES_LIMIT
+from reviews.models import SimilarTitle, Title
+
+CHUNK_SIZE = 2000
+
+
+def chunks(iterable, size=CHUNK_SIZE):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class GenreIndex:
+    """Маски жанров, категории и инвертированный индекс каталога."""
+
+    def __init__(self):
+        self.masks = {}
+        self.categories = dict(Title.objects.values_list('pk', 'category_id'))
+        self.titles_by_bit = {}
+        bits = {}
+        links = Title.genre.through.objects.order_by().values_list(
+            'title_id', 'genre_id'
+        ).iterator(chunk_size=CHUNK_SIZE)
+        for title_id, genre_id in links:
+            bit = bits.setdefault(genre_id, len(bits))
+            self.masks[title_id] = self.masks.get(title_id, 0) | 1 << bit
+            self.titles_by_bit.setdefault(bit, []).append(title_id)
+
+    def bits(self, mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def related(self, title_ids):
+        """Произведения, у которых есть общий жанр с данными."""
+        mask = 0
+        for title_id in title_ids:
+            mask |= self.masks.get(title_id, 0)
+        return {
+            related_id
+            for bit in self.bits(mask)
+            for related_id in self.titles_by_bit[bit]
+        }
+
+    def score(self, title_id, other_id):
+        mask, other = self.masks[title_id], self.masks[other_id]
+        jaccard = (mask & other).bit_count() / (mask | other).bit_count()
+        category = self.categories[title_id]
+        same_category = (
+            category is not None and category == self.categories[other_id]
+        )
+        return (
+            (1 - SIMILAR_CATEGORY_WEIGHT) * jaccard
+            + SIMILAR_CATEGORY_WEIGHT * same_category
+        )
+
+    def similar(self, title_id, limit=SIMILAR_TITLES_LIMIT):
+        """Пары (сходство, id) ближайших соседей произведения."""
+        candidates = self.related((title_id,))
+        candidates.discard(title_id)
+        return nlargest(
+            limit,
+            ((self.score(title_id, other), other) for other in candidates),
+            key=lambda pair: (pair[0], -pair[1])
+        )
+
+
+def entered_lists(index, changed_ids, limit=SIMILAR_TITLES_LIMIT):
+    """Произведения, в список соседей которых входит изменившееся.
+
+    Изменившиеся произведения сравниваются только с произведениями
+    с общим жанром. Список такого произведения нужно переписать, если
+    он неполон или изменившееся не хуже его последнего соседа.
+    """
+    best = {}
+    for title_id in changed_ids:
+        if title_id not in index.masks:
+            continue
+        for other in index.related((title_id,)) - changed_ids:
+            score = index.score(other, title_id)
+            best[other] = max(score, best.get(other, score))
+    entered = set()
+    for ids in chunks(best):
+        lowest = dict(SimilarTitle.objects.filter(
+            title_id__in=ids
+        ).order_by().values('title_id').annotate(
+            count=Count('pk'), lowest=Min('score')
+        ).filter(count__gte=limit).values_list('title_id', 'lowest'))
+        entered.update(
+            title_id for title_id in ids
+            if title_id not in lowest or best[title_id] >= lowest[title_id]
+        )
+    return entered
+
+
+def clear_outdated(outdated, title_ids):
+    """Снимает отметки, не поднятые снова с момента их чтения."""
+    by_count = {}
+    for title_id in title_ids:
+        if outdated.get(title_id):
+            by_count.setdefault(outdated[title_id], []).append(title_id)
+    for count, ids in by_count.items():
+        Title.objects.filter(
+            pk__in=ids, similar_outdated=count
+        ).update(similar_outdated=0)
+
+
+def build_similar_titles(full=False, limit=SIMILAR_TITLES_LIMIT):
+    """Пересчитывает соседей изменившихся произведений.
+
+    Кроме самих изменившихся произведений пересчитываются те, чей список
+    мог измениться: куда изменившееся теперь входит и где оно уже было
+    соседом. С full=True пересчитывается весь каталог. Отметки снимаются
+    в транзакции каждой части, поэтому прерванный запуск оставляет
+    непересчитанные произведения отмеченными. Возвращает число
+    произведений с пересчитанными соседями.
+    """
+    outdated = Title.objects.all()
+    if not full:
+        outdated = outdated.filter(similar_outdated__gt=0)
+    # Счётчики читаются до каталога: изменения во время расчёта
+    # увеличат их, и такие отметки сохранятся до следующего запуска.
+    outdated = dict(outdated.values_list('pk', 'similar_outdated'))
+    if not outdated:
+        return 0
+    outdated_ids = set(outdated)
+    index = GenreIndex()
+    if full:
+        targets = set(index.categories)
+    else:
+        targets = outdated_ids | entered_lists(index, outdated_ids, limit)
+        for ids in chunks(outdated_ids):
+            targets.update(SimilarTitle.objects.filter(
+                similar_id__in=ids
+            ).values_list('title_id', flat=True))
+        targets &= set(index.categories)
+    for ids in chunks(sorted(targets)):
+        with transaction.atomic():
+            SimilarTitle.objects.filter(title_id__in=ids).delete()
+            SimilarTitle.objects.bulk_create(
+                SimilarTitle(title_id=title_id, similar_id=other, score=score)
+                for title_id in ids if title_id in index.masks
+                for score, other in index.similar(title_id, limit)
+            )
+            clear_outdated(outdated, ids)
+    return len(targets)
@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import caches
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_caches()
+    yield
+    clear_caches()
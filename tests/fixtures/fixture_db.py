@@ -0,0 +1,15 @@
+import pytest
+from django.conf import settings
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(
+    django_db_modify_db_settings_parallel_suffix, tmp_path_factory
+):
+    # SQLite в памяти блокирует таблицы вместо ожидания, поэтому тесты
+    # с параллельными запросами требуют тестовую БД в файле.
+    database = settings.DATABASES['default']
+    database['TEST']['NAME'] = str(
+        tmp_path_factory.mktemp('db') / 'test_db.sqlite3'
+    )
+    database.setdefault('OPTIONS', {})['timeout'] = 20
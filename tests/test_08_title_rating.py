@@ -0,0 +1,232 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_review_writes(self, admin_client, user_client,
+                                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) is None
+
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв пользователя', 2
+        ).json()['id']
+        create_single_review(
+            moderator_client, title_id, 'Отзыв модератора', 8
+        )
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        response = user_client.patch(url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+    def test_02_rating_after_author_deleted(self, admin_client, user_client,
+                                            moderator_client, moderator):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отзыв пользователя', 4)
+        create_single_review(
+            moderator_client, title_id, 'Отзыв модератора', 10
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/users/{moderator.username}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 4, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'каскадном удалении отзывов вместе с автором.'
+        )
+
+    def test_03_ordering_by_rating(self, admin_client, user_client,
+                                   moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 3)
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 9)
+        create_single_review(moderator_client, titles[1]['id'], 'Отзыв', 7)
+
+        response = admin_client.get('/api/v1/titles/?ordering=-rating')
+        assert response.status_code == HTTPStatus.OK
+        ratings = [title['rating'] for title in response.json()['results']]
+        assert ratings == [8, 3], (
+            'Проверьте, что GET-запрос к `/api/v1/titles/` поддерживает '
+            'сортировку по полю `rating`.'
+        )
+
+        response = admin_client.get(
+            '/api/v1/titles/?ordering=rating&category='
+            f'{titles[1]["category"]}'
+        )
+        assert [
+            title['id'] for title in response.json()['results']
+        ] == [titles[1]['id']]
+
+    def test_04_rating_histogram(self, client, admin_client, user_client,
+                                 moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/rating-histogram/'
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв пользователя', 3
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'Отзыв', 10)
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 10}
+        )
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{url}` должен быть доступен без авторизации.'
+        )
+        histogram = {row['score']: row['count'] for row in response.json()}
+        assert histogram == {score: 0 for score in range(1, 10)} | {10: 2}, (
+            'Проверьте, что гистограмма оценок содержит число отзывов '
+            'для каждой оценки от 1 до 10.'
+        )
+
+        response = client.get('/api/v1/titles/0/rating-histogram/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_rating_survives_stale_writes(self, admin_client, user_client,
+                                             moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв пользователя', 5
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'Отзыв', 5)
+
+        first, second = (Review.objects.get(pk=review_id) for _ in range(2))
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count) == (14, 2), (
+            'Проверьте, что агрегаты произведения считаются по сохранённым '
+            'отзывам, а не по оценке, загруженной в устаревший экземпляр.'
+        )
+        assert self.get_rating(admin_client, title_id) == 7
+
+        first.delete()
+        Review(pk=review_id, title_id=title_id, score=9).delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.reviews_count) == (5, 1), (
+            'Проверьте, что повторное удаление отзыва не уменьшает '
+            'агрегаты произведения второй раз.'
+        )
+        assert self.get_rating(admin_client, title_id) == 5
+
+    def test_06_histogram_survives_stale_writes(self, client, admin_client,
+                                                user_client,
+                                                moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/rating-histogram/'
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв пользователя', 5
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'Отзыв', 5)
+
+        first, second = (Review.objects.get(pk=review_id) for _ in range(2))
+        first.score = 7
+        first.save()
+        second.score = 9
+        second.save()
+        histogram = {row['score']: row['count'] for row in client.get(
+            url
+        ).json()}
+        assert (histogram[5], histogram[7], histogram[9]) == (1, 0, 1), (
+            'Проверьте, что гистограмма оценок строится по сохранённым '
+            'отзывам, а не по оценке устаревшего экземпляра.'
+        )
+
+        first.delete()
+        Review(pk=review_id, title_id=title_id, score=9).delete()
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        histogram = {row['score']: row['count'] for row in response.json()}
+        assert histogram == {score: 0 for score in range(1, 11)} | {5: 1}, (
+            'Проверьте, что повторное удаление отзыва не уменьшает '
+            'гистограмму оценок второй раз.'
+        )
+
+    def test_07_text_edit_skips_aggregates(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв пользователя', 5
+        ).json()['id']
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if 'reviews_scorecount' in query['sql']
+            or query['sql'].startswith('UPDATE "reviews_title"')
+        ], (
+            'Проверьте, что правка текста отзыва не обновляет агрегаты '
+            'оценок произведения.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(url, data={'score': 7})
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('DELETE FROM "reviews_scorecount"')
+            or 'SUM(' in query['sql']
+        ], (
+            'Проверьте, что изменение оценки сдвигает счётчики гистограммы '
+            'и агрегаты произведения, а не пересчитывает их по всем '
+            'отзывам.'
+        )
+        histogram = {
+            row['score']: row['count'] for row in user_client.get(
+                f'/api/v1/titles/{title_id}/rating-histogram/'
+            ).json()
+        }
+        assert (histogram[5], histogram[7]) == (0, 1)
@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+def create_catalog(titles_count):
+    category, _ = Category.objects.get_or_create(name='Фильм', slug='films')
+    genres = [
+        Genre.objects.get_or_create(
+            name=f'Жанр {idx}', slug=f'genre-{idx}'
+        )[0]
+        for idx in range(3)
+    ]
+    for idx in range(titles_count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000 + idx, category=category
+        )
+        title.genre.set(genres)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(context)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize('query', (
+        '',
+        '?genre=genre-1',
+        '?category=films&ordering=name',
+    ))
+    def test_01_list_queries_do_not_depend_on_page_size(self, client, query):
+        create_catalog(1)
+        single_title_queries = count_queries(client, self.TITLES_URL + query)
+        create_catalog(9)
+        assert count_queries(
+            client, self.TITLES_URL + query
+        ) == single_title_queries, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            'фиксированное число запросов к БД независимо от числа '
+            'произведений на странице.'
+        )
+
+    def test_02_detail_queries(self, client):
+        create_catalog(1)
+        title = Title.objects.get()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.TITLES_URL}{title.id}/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(context) == 2, (
+            'Проверьте, что получение произведения загружает категорию '
+            'и жанры без дополнительных запросов на каждый объект.'
+        )
+
+    def test_03_patch_genre_writes_only_difference(self, admin_client):
+        create_catalog(1)
+        title = Title.objects.get()
+        url = f'{self.TITLES_URL}{title.id}/'
+
+        def patch_genres(slugs):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.patch(
+                    url, data={'genre': slugs}, format='json'
+                )
+            assert response.status_code == HTTPStatus.OK
+            through_writes = [
+                query['sql'].split()[0]
+                for query in context.captured_queries
+                if 'reviews_title_genre' in query['sql']
+                and not query['sql'].startswith('SELECT')
+            ]
+            return response.json(), through_writes
+
+        data, writes = patch_genres(['genre-0', 'genre-1', 'genre-2'])
+        assert writes == [], (
+            'Проверьте, что PATCH с неизменным списком жанров не пишет в '
+            'таблицу связей.'
+        )
+        data, writes = patch_genres(['genre-0', 'genre-2'])
+        assert writes == ['DELETE']
+        assert [genre['slug'] for genre in data['genre']] == [
+            'genre-0', 'genre-2'
+        ]
+        data, writes = patch_genres(['genre-1'])
+        assert writes == ['DELETE', 'INSERT'], (
+            'Проверьте, что PATCH жанров выполняет не больше одного DELETE '
+            'и одного INSERT в таблице связей.'
+        )
+        assert [genre['slug'] for genre in data['genre']] == ['genre-1']
+
+    def test_04_genre_slugs_resolved_in_one_query(self, admin_client):
+        create_catalog(1)
+        title = Title.objects.get()
+        url = f'{self.TITLES_URL}{title.id}/'
+        slugs = [f'genre-{idx}' for idx in range(3)]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                url, data={'genre': slugs}, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        genre_lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_genre"' in query['sql']
+            and 'reviews_title_genre' not in query['sql']
+        ]
+        assert len(genre_lookups) == 1, (
+            'Проверьте, что слаги жанров разрешаются одним запросом к БД.'
+        )
+
+        response = admin_client.patch(
+            url,
+            data={'genre': ['genre-0', 'missing-1', 'missing-2']},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        error = str(response.json()['genre'])
+        assert 'missing-1' in error and 'missing-2' in error, (
+            'Проверьте, что в ошибке перечислены все несуществующие слаги '
+            'жанров.'
+        )
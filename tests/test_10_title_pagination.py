@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+from tests.utils import make_cursor, walk
+
+
+def create_titles_with_same_years(count):
+    category = Category.objects.create(name='Фильм', slug='films')
+    for idx in range(count):
+        Title.objects.create(
+            name=f'Произведение {idx % 4}',
+            year=2000 + idx % 3,
+            category=category,
+            rating=None if idx % 5 == 0 else idx % 3
+        )
+
+
+def sort_key(title, ordering):
+    value = getattr(title, ordering.lstrip('-'))
+    # NULL считается меньше любого значения.
+    return (value is not None, value)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleCursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.mark.parametrize(
+        'ordering', ('-year', 'name', 'year', '-rating', 'rating')
+    )
+    def test_01_cursor_walks_whole_catalog(self, client, ordering):
+        create_titles_with_same_years(23)
+        url = f'{self.TITLES_URL}?pagination=cursor&ordering={ordering}'
+        descending = ordering.startswith('-')
+        expected = [
+            title.id for title in sorted(
+                Title.objects.all(),
+                key=lambda title: (sort_key(title, ordering), title.id),
+                reverse=descending
+            )
+        ]
+
+        pages = walk(client, url, 'next')
+        assert [len(page) for page in pages] == [10, 10, 3]
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация по `/api/v1/titles/` '
+            'возвращает все произведения без пропусков и повторов.'
+        )
+
+        last_page_url = client.get(url).json()['next']
+        last_page_url = client.get(last_page_url).json()['next']
+        back_pages = walk(client, last_page_url, 'previous')
+        assert sum(reversed(back_pages), []) == expected
+
+    def test_02_invalid_cursor(self, client):
+        response = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&cursor=broken'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('query, position', (
+        ('', ['abc', 1]),
+        ('', [{'x': 1}, 1]),
+        ('', [None, None]),
+        ('', [2000, 'abc']),
+        ('&search=фильм', ['x', 1]),
+    ))
+    def test_03_tampered_cursor(self, client, query, position):
+        create_titles_with_same_years(3)
+        response = client.get(
+            f'{self.TITLES_URL}?pagination=cursor{query}'
+            f'&cursor={make_cursor(position)}'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор со значениями неподходящего типа '
+            'отклоняется как некорректный, а не приводит к ошибке сервера.'
+        )
+
+    def test_04_page_number_pagination_by_default(self, client):
+        create_titles_with_same_years(3)
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 3
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'терминат') == [titles[0]['name']], (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` находит произведения по началу слова в названии.'
+        )
+        assert self.search(client, 'yippie') == [titles[1]['name']], (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с параметром '
+            '`search` ищет по описанию произведения.'
+        )
+        assert self.search(client, '"OR*(') == []
+
+    def test_02_search_ranks_name_matches_first(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/',
+            data={'description': 'Не крепкий, но орешек'}
+        )
+        assert self.search(client, 'орешек') == [
+            titles[1]['name'], titles[0]['name']
+        ]
+
+    def test_03_index_follows_title_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чужой') == ['Чужой']
+
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert self.search(client, 'чужой') == []
+
+        Title.objects.filter(pk=titles[1]['id']).update(name='Хищник')
+        call_command('rebuild_search_index')
+        assert self.search(client, 'хищник') == ['Хищник']
@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Autocomplete:
+
+    AUTOCOMPLETE_URL = '/api/v1/autocomplete/'
+
+    def test_01_prefix_suggestions(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Криминал', 'slug': 'crime'}
+        )
+
+        response = client.get(self.AUTOCOMPLETE_URL, {'q': '  кР'})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.AUTOCOMPLETE_URL}` должен быть доступен '
+            'без авторизации.'
+        )
+        assert response.json() == [
+            {'type': 'title', 'name': titles[1]['name'],
+             'id': titles[1]['id']},
+            {'type': 'genre', 'name': 'Криминал', 'slug': 'crime'},
+        ], (
+            f'Проверьте, что `{self.AUTOCOMPLETE_URL}` ищет произведения, '
+            'жанры и категории по началу названия без учёта регистра.'
+        )
+
+        response = client.get(self.AUTOCOMPLETE_URL, {'q': 'фильм'})
+        assert response.json() == [
+            {'type': 'category', 'name': categories[0]['name'],
+             'slug': categories[0]['slug']},
+        ]
+
+    def test_02_renamed_title(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Ёлки'}
+        )
+        response = client.get(self.AUTOCOMPLETE_URL, {'q': 'ел'})
+        assert [row['name'] for row in response.json()] == ['Ёлки']
+        assert client.get(self.AUTOCOMPLETE_URL).json() == []
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_fields(self, client, admin_client):
+        create_reviews(admin_client, {})
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                self.TITLES_URL, {'fields': 'id,name,rating'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                f'Проверьте, что GET-запрос к `{self.TITLES_URL}` с '
+                'параметром `fields` возвращает только перечисленные поля.'
+            )
+        assert len(context) == 2, (
+            'Проверьте, что для исключённых полей `genre` и `category` '
+            'не выполняются дополнительные запросы к БД.'
+        )
+        sql = context.captured_queries[-1]['sql']
+        assert 'description' not in sql
+        assert 'reviews_category' not in sql
+
+    def test_02_title_omit(self, client, admin_client):
+        create_reviews(admin_client, {})
+        response = client.get(self.TITLES_URL, {'omit': 'genre,description'})
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'year', 'rating', 'category'}
+
+    def test_03_review_fields(self, client, admin_client, user, user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        response = client.get(url, {'fields': 'id,score'})
+        assert response.json()['results'] == [
+            {'id': reviews[0]['id'], 'score': reviews[0]['score']}
+        ]
+
+        response = user_client.post(
+            f'{self.TITLES_URL}{titles[1]["id"]}/reviews/?fields=id',
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['text'] == 'Отзыв', (
+            'Проверьте, что параметр `fields` не влияет на запросы на запись.'
+        )
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleListCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_titles(self, client, query=''):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.TITLES_URL + query)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(context)
+
+    def test_01_repeated_query_is_cached(self, client, admin_client):
+        create_titles(admin_client)
+        data, _ = self.get_titles(client, '?year=1984&genre=comedy')
+        cached_data, queries = self.get_titles(
+            client, '?genre=comedy&year=1984'
+        )
+        assert cached_data == data
+        assert queries == 0, (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` с '
+            'теми же параметрами отдаётся из кэша без запросов к БД.'
+        )
+
+    def test_02_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, _ = create_titles(admin_client)
+        self.get_titles(client)
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 6)
+        data, queries = self.get_titles(client)
+        assert queries > 0
+        ratings = {title['id']: title['rating'] for title in data['results']}
+        assert ratings[titles[0]['id']] == 6, (
+            'Проверьте, что новый отзыв сбрасывает кэш списка произведений.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'genre': ['comedy']}
+        )
+        data, _ = self.get_titles(client, '?genre=comedy')
+        assert data['count'] == 2, (
+            'Проверьте, что изменение жанров произведения сбрасывает кэш '
+            'списка произведений.'
+        )
+
+        admin_client.delete('/api/v1/categories/films/')
+        data, _ = self.get_titles(client, '?category=books')
+        assert data['count'] == 1
+        data, _ = self.get_titles(client)
+        categories = {
+            title['id']: title['category'] for title in data['results']
+        }
+        assert categories[titles[0]['id']] is None
@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_review
+
+
+def revalidate(client, url, etag):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, len(context)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ConditionalGet:
+
+    def test_01_not_modified_without_queries(self, client, admin_client,
+                                             user, user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        for url in (
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            etag = response['ETag']
+            assert etag.startswith('"'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'сильный ETag.'
+            )
+            assert response.has_header('Last-Modified')
+
+            response, queries = revalidate(client, url, etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+            assert queries == 0, (
+                'Проверьте, что ответ 304 отдаётся без запросов к БД.'
+            )
+
+    def test_02_writes_change_etag(self, client, admin_client, user,
+                                   user_client, moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        title_url = f'/api/v1/titles/{title_id}/'
+        reviews_url = f'{title_url}reviews/'
+        comments_url = f'{reviews_url}{review_id}/comments/'
+        etags = {
+            url: client.get(url)['ETag']
+            for url in (title_url, reviews_url, comments_url)
+        }
+
+        create_single_review(moderator_client, title_id, 'Отзыв', 1)
+        assert revalidate(
+            client, title_url, etags[title_url]
+        )[0].status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag произведения.'
+        )
+        assert revalidate(
+            client, reviews_url, etags[reviews_url]
+        )[0].status_code == HTTPStatus.OK
+        assert revalidate(
+            client, comments_url, etags[comments_url]
+        )[0].status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert revalidate(
+            client, comments_url, etags[comments_url]
+        )[0].status_code == HTTPStatus.OK, (
+            'Проверьте, что смена логина автора меняет ETag комментариев.'
+        )
+
+        etag = client.get(title_url)['ETag']
+        admin_client.delete('/api/v1/genres/horror/')
+        assert revalidate(
+            client, title_url, etag
+        )[0].status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление жанра меняет ETag произведения.'
+        )
+
+    def test_03_page_eviction_keeps_etag(self, client, admin_client, user,
+                                         user_client):
+        _, _, titles = create_comments(admin_client, {user: user_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        cache.clear()
+        response, _ = revalidate(client, url, etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что штампы версий хранятся отдельно от кэша '
+            'страниц и его очистка не меняет ETag.'
+        )
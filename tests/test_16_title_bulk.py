@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleBulkCreate:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def make_payload(self, count, genres, categories):
+        return [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[idx % 2]['slug'],
+                'description': 'Описание',
+            }
+            for idx in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client, client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        payload = self.make_payload(20, genres, categories)
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.BULK_URL, data=payload, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'с корректными данными возвращает ответ со статусом 201.'
+        )
+        data = response.json()
+        assert len(data) == 20
+        assert {genre['slug'] for genre in data[0]['genre']} == {
+            genre['slug'] for genre in genres
+        }
+        assert len(context) < 20, (
+            'Проверьте, что массовое создание не выполняет запросы к БД '
+            'для каждого произведения.'
+        )
+
+        response = client.get('/api/v1/titles/', {'search': 'произведение'})
+        assert response.json()['count'] == 20
+        response = client.get('/api/v1/titles/', {'genre': genres[0]['slug']})
+        assert response.json()['count'] == 20
+
+    def test_02_bulk_errors(self, admin_client, user_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        payload = self.make_payload(3, genres, categories)
+        payload[1]['genre'] = ['missing']
+        payload[2]['category'] = 'missing'
+
+        response = user_client.post(self.BULK_URL, data=payload, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.post(
+            self.BULK_URL, data=payload, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'genre' in errors[1]
+        assert 'category' in errors[2], (
+            f'Проверьте, что `{self.BULK_URL}` возвращает ошибки для '
+            'каждого элемента списка.'
+        )
+        assert not Title.objects.exists()
+
+        response = admin_client.post(self.BULK_URL, data=[], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.BULK_URL}` с пустым '
+            'списком возвращает ответ со статусом 400.'
+        )
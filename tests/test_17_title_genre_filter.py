@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+def create_titles_with_genres():
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = {
+        slug: Genre.objects.create(name=slug, slug=slug)
+        for slug in ('drama', 'comedy', 'horror')
+    }
+    titles = {}
+    for name, slugs in (
+        ('Драма', ('drama',)),
+        ('Драмеди', ('drama', 'comedy')),
+        ('Всё сразу', ('drama', 'comedy', 'horror')),
+        ('Ужасы', ('horror',)),
+    ):
+        title = Title.objects.create(name=name, year=2000, category=category)
+        title.genre.set([genres[slug] for slug in slugs])
+        titles[name] = title.id
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TitleGenreFilter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_ids(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        ids = [title['id'] for title in data['results']]
+        assert len(ids) == len(set(ids)) == data['count'], (
+            'Проверьте, что фильтрация по нескольким жанрам не дублирует '
+            'произведения и не искажает `count`.'
+        )
+        return set(ids)
+
+    def test_01_any_genre(self, client):
+        titles = create_titles_with_genres()
+        expected = {
+            titles['Драма'], titles['Драмеди'], titles['Всё сразу']
+        }
+        assert self.get_ids(client, 'genre=drama&genre=comedy') == expected
+        assert self.get_ids(
+            client, 'genre=drama&genre=comedy&genre_mode=any'
+        ) == expected, (
+            'Проверьте, что `genre_mode=any` возвращает произведения '
+            'хотя бы с одним из жанров.'
+        )
+
+    def test_02_all_genres(self, client):
+        titles = create_titles_with_genres()
+        assert self.get_ids(
+            client, 'genre=drama&genre=comedy&genre_mode=all'
+        ) == {titles['Драмеди'], titles['Всё сразу']}, (
+            'Проверьте, что `genre_mode=all` возвращает только '
+            'произведения со всеми указанными жанрами.'
+        )
+        assert self.get_ids(
+            client, 'genre=drama&genre=horror&genre=drama&genre_mode=all'
+        ) == {titles['Всё сразу']}
+
+    def test_03_invalid_mode(self, client):
+        create_titles_with_genres()
+        response = client.get(
+            f'{self.TITLES_URL}?genre=drama&genre_mode=none'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Title
+
+
+def create_titles_by_years():
+    films = Category.objects.create(name='Фильм', slug='films')
+    books = Category.objects.create(name='Книга', slug='books')
+    for year in range(1985, 2006):
+        Title.objects.create(name=f'Фильм {year}', year=year, category=films)
+        Title.objects.create(name=f'Книга {year}', year=year, category=books)
+
+
+def get_list_query_plan(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    sql = next(
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "reviews_title"' in query['sql']
+        and 'COUNT(' not in query['sql']
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return ' '.join(row[-1] for row in cursor.fetchall())
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleYearRange:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_year_range_filter(self, client):
+        create_titles_by_years()
+        response = client.get(
+            f'{self.TITLES_URL}?category=films&year_min=1990&year_max=2000'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == 11, (
+            'Проверьте, что `year_min` и `year_max` ограничивают год '
+            'выпуска включительно.'
+        )
+        years = [title['year'] for title in data['results']]
+        assert years == sorted(years, reverse=True)
+        assert years[0] == 2000
+
+        response = client.get(f'{self.TITLES_URL}?year_min=2005')
+        assert response.json()['count'] == 2
+        response = client.get(f'{self.TITLES_URL}?year_max=nineties')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize('query, index', (
+        ('category=films&year_min=1990&year_max=2000',
+         'title_category_year_id_idx'),
+        ('category=films&ordering=year', 'title_category_year_id_idx'),
+        ('year_min=1990&year_max=2000', 'title_year_id_idx'),
+        ('pagination=cursor&category=films&year_max=2000',
+         'title_category_year_id_idx'),
+        ('category=films&ordering=-rating', 'title_category_rating_idx'),
+    ))
+    def test_02_query_plan_uses_index(self, client, query, index):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite.')
+        create_titles_by_years()
+        plan = get_list_query_plan(client, f'{self.TITLES_URL}?{query}')
+        assert index in plan, (
+            f'Проверьте, что запрос `{self.TITLES_URL}?{query}` использует '
+            f'индекс `{index}`. План запроса: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что запрос `{self.TITLES_URL}?{query}` не '
+            f'сортирует результаты во временном B-дереве. План: {plan}'
+        )
@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+def create_catalog():
+    films = Category.objects.create(name='Фильм', slug='films')
+    books = Category.objects.create(name='Книга', slug='books')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    for name, year, category, genres in (
+        ('Первый', 1994, films, (drama, comedy)),
+        ('Второй', 1999, films, (drama,)),
+        ('Третий', 2003, films, (comedy,)),
+        ('Четвёртый', 1995, books, (drama,)),
+        ('Пятый', 2010, None, ()),
+    ):
+        title = Title.objects.create(name=name, year=year, category=category)
+        title.genre.set(genres)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleFacets:
+
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    def test_01_facets_for_whole_catalog(self, client):
+        create_catalog()
+        response = client.get(self.FACETS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Эндпоинт `{self.FACETS_URL}` должен быть доступен без '
+            'авторизации.'
+        )
+        data = response.json()
+        assert data['count'] == 5
+        assert data['genre'] == [
+            {'slug': 'drama', 'name': 'Драма', 'count': 3},
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+        ], (
+            'Проверьте, что фасеты содержат число произведений каждого '
+            'жанра.'
+        )
+        assert data['category'] == [
+            {'slug': 'films', 'name': 'Фильм', 'count': 3},
+            {'slug': 'books', 'name': 'Книга', 'count': 1},
+        ]
+        assert data['decade'] == [
+            {'decade': 1990, 'count': 3},
+            {'decade': 2000, 'count': 1},
+            {'decade': 2010, 'count': 1},
+        ], (
+            'Проверьте, что фасеты содержат число произведений каждого '
+            'десятилетия.'
+        )
+
+    def test_02_facets_follow_title_filters(self, client):
+        create_catalog()
+        data = client.get(
+            f'{self.FACETS_URL}?genre=drama&genre=comedy&year_max=1999'
+        ).json()
+        assert data['count'] == 3, (
+            'Проверьте, что фасеты учитывают параметры фильтрации '
+            'списка произведений и не дублируют произведения.'
+        )
+        assert {row['slug']: row['count'] for row in data['genre']} == {
+            'drama': 3, 'comedy': 1
+        }
+        assert data['decade'] == [{'decade': 1990, 'count': 3}]
+
+        response = client.get(f'{self.FACETS_URL}?genre=missing')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_facets_queries_and_cache(self, client):
+        create_catalog()
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(self.FACETS_URL).status_code == HTTPStatus.OK
+        assert len(context) <= 4, (
+            'Проверьте, что все фасеты считаются несколькими '
+            'сгруппированными запросами.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.FACETS_URL)
+        assert len(context) == 0, (
+            'Проверьте, что повторный запрос фасетов берётся из кэша.'
+        )
+
+        Title.objects.create(name='Шестой', year=2011)
+        assert client.get(self.FACETS_URL).json()['count'] == 6, (
+            'Проверьте, что кэш фасетов сбрасывается при изменении '
+            'произведений.'
+        )
+
+    def test_04_decades_of_negative_years(self, client):
+        for year in (-15, -5, 5):
+            Title.objects.create(name=f'Произведение {year}', year=year)
+        data = client.get(self.FACETS_URL).json()
+        assert data['decade'] == [
+            {'decade': -20, 'count': 1},
+            {'decade': -10, 'count': 1},
+            {'decade': 0, 'count': 1},
+        ], (
+            'Проверьте, что год до нашей эры попадает в десятилетие, '
+            'округлённое вниз, а не к нулю.'
+        )
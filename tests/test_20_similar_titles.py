@@ -0,0 +1,169 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db.models import F
+
+from reviews import similarity
+from reviews.models import Category, Genre, SimilarTitle, Title
+from reviews.similarity import GenreIndex, build_similar_titles
+
+
+def create_catalog():
+    films = Category.objects.create(name='Фильм', slug='films')
+    books = Category.objects.create(name='Книга', slug='books')
+    genres = {
+        slug: Genre.objects.create(name=slug, slug=slug)
+        for slug in ('drama', 'comedy', 'horror', 'western')
+    }
+    titles = {}
+    for name, category, slugs in (
+        ('base', films, ('drama', 'comedy')),
+        ('twin', films, ('drama', 'comedy')),
+        ('twin-book', books, ('drama', 'comedy')),
+        ('half', films, ('drama',)),
+        ('far', books, ('comedy', 'horror', 'western')),
+        ('other', films, ('horror',)),
+    ):
+        title = Title.objects.create(name=name, year=2000, category=category)
+        title.genre.set([genres[slug] for slug in slugs])
+        titles[name] = title.id
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SimilarTitles:
+
+    URL_TEMPLATE = '/api/v1/titles/{title_id}/similar/'
+
+    def get_similar(self, client, title_id):
+        response = client.get(self.URL_TEMPLATE.format(title_id=title_id))
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()]
+
+    def test_01_similar_titles_ranking(self, client):
+        titles = create_catalog()
+        call_command('build_similar_titles')
+        assert self.get_similar(client, titles['base']) == [
+            'twin', 'twin-book', 'half', 'far'
+        ], (
+            'Проверьте, что похожие произведения упорядочены по сходству '
+            'наборов жанров и совпадению категории.'
+        )
+        assert not Title.objects.filter(similar_outdated__gt=0).exists()
+
+        response = client.get(self.URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_incremental_rebuild(self, admin_client, client):
+        titles = create_catalog()
+        call_command('build_similar_titles')
+        response = admin_client.patch(
+            f'/api/v1/titles/{titles["other"]}/',
+            data={'genre': ['drama', 'comedy']},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert list(Title.objects.filter(
+            similar_outdated__gt=0
+        ).values_list('pk', flat=True)) == [titles['other']], (
+            'Проверьте, что смена жанров отмечает произведение для '
+            'пересчёта похожих.'
+        )
+        call_command('build_similar_titles')
+        assert 'other' in self.get_similar(client, titles['base']), (
+            'Проверьте, что пересчёт обновляет соседей произведений '
+            'с общими жанрами.'
+        )
+        assert self.get_similar(client, titles['other'])[0] == 'base'
+
+        Genre.objects.get(slug='horror').delete()
+        call_command('build_similar_titles')
+        assert 'far' in self.get_similar(client, titles['twin-book'])
+
+        Title.objects.get(pk=titles['twin']).delete()
+        assert not SimilarTitle.objects.filter(
+            similar_id=titles['twin']
+        ).exists()
+        call_command('build_similar_titles')
+        assert 'twin' not in self.get_similar(client, titles['base'])
+
+    def test_03_full_rebuild_matches_incremental(self):
+        create_catalog()
+        call_command('build_similar_titles')
+        incremental = set(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'score'
+        ))
+        call_command('build_similar_titles', full=True)
+        assert set(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'score'
+        )) == incremental
+
+    def test_04_incremental_rebuild_skips_untouched_lists(self):
+        titles = create_catalog()
+        build_similar_titles(full=True, limit=2)
+        base_rows = set(SimilarTitle.objects.filter(
+            title_id=titles['base']
+        ).values_list('pk', flat=True))
+
+        title = Title.objects.get(pk=titles['other'])
+        title.genre.set(Genre.objects.filter(slug__in=('drama', 'western')))
+        assert build_similar_titles(limit=2) == 3, (
+            'Проверьте, что инкрементальный пересчёт переписывает только '
+            'изменившееся произведение и списки, куда оно входит или '
+            'входило.'
+        )
+        assert set(SimilarTitle.objects.filter(
+            title_id=titles['base']
+        ).values_list('pk', flat=True)) == base_rows, (
+            'Проверьте, что список соседей, в который изменившееся '
+            'произведение не входит, не переписывается.'
+        )
+        incremental = set(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'score'
+        ))
+        build_similar_titles(full=True, limit=2)
+        assert set(SimilarTitle.objects.values_list(
+            'title_id', 'similar_id', 'score'
+        )) == incremental
+
+    def test_05_interrupted_rebuild_keeps_marks(self, monkeypatch):
+        titles = create_catalog()
+        chunks, similar = similarity.chunks, GenreIndex.similar
+
+        def similar_or_fail(index, title_id, limit):
+            if title_id == titles['far']:
+                raise RuntimeError('Запуск прерван.')
+            return similar(index, title_id, limit)
+
+        monkeypatch.setattr(
+            similarity, 'chunks', lambda iterable: chunks(iterable, 2)
+        )
+        monkeypatch.setattr(GenreIndex, 'similar', similar_or_fail)
+        with pytest.raises(RuntimeError):
+            build_similar_titles()
+        assert set(Title.objects.filter(
+            similar_outdated__gt=0
+        ).values_list('pk', flat=True)) == {titles['far'], titles['other']}, (
+            'Проверьте, что отметки снимаются вместе с записью соседей '
+            'своей части, и прерванный пересчёт оставляет остальные '
+            'произведения отмеченными.'
+        )
+
+        monkeypatch.setattr(GenreIndex, 'similar', similar)
+        init = GenreIndex.__init__
+
+        def init_and_change(index):
+            init(index)
+            Title.objects.filter(pk=titles['far']).update(
+                similar_outdated=F('similar_outdated') + 1
+            )
+
+        monkeypatch.setattr(GenreIndex, '__init__', init_and_change)
+        build_similar_titles()
+        assert list(Title.objects.filter(
+            similar_outdated__gt=0
+        ).values_list('pk', flat=True)) == [titles['far']], (
+            'Проверьте, что пересчёт не снимает отметку, поднятую снова '
+            'во время его работы.'
+        )
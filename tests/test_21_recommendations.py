@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Recommendation, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Recommendations:
+
+    URL = '/api/v1/users/me/recommendations/'
+
+    def create_ratings(self, django_user_model, user):
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(5)
+        ]
+        for idx in range(6):
+            author = django_user_model.objects.create_user(
+                username=f'critic{idx}', email=f'critic{idx}@yamdb.fake'
+            )
+            for title, score in zip(titles, (10, 10, 9, 2, 1)):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score
+                )
+        for title in titles[:2]:
+            Review.objects.create(
+                title=title, author=user, text='Отзыв', score=10
+            )
+        return titles
+
+    def test_01_recommendations(self, client, user_client, user,
+                                django_user_model):
+        titles = self.create_ratings(django_user_model, user)
+        assert client.get(self.URL).status_code == HTTPStatus.UNAUTHORIZED
+
+        response = user_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == []
+
+        call_command('build_recommendations', epochs=30)
+        response = user_client.get(self.URL)
+        assert response.status_code == HTTPStatus.OK
+        recommended = [title['id'] for title in response.json()]
+        assert recommended == [title.id for title in titles[2:]], (
+            'Проверьте, что рекомендации не содержат уже оценённых '
+            'произведений и упорядочены по прогнозу оценки.'
+        )
+
+    def test_02_users_without_reviews(self, user, django_user_model):
+        self.create_ratings(django_user_model, user)
+        call_command('build_recommendations', epochs=1)
+        assert Recommendation.objects.filter(user=user).exists()
+        user.reviews.all().delete()
+        call_command('build_recommendations', epochs=1)
+        assert not Recommendation.objects.filter(user=user).exists(), (
+            'Проверьте, что пересчёт удаляет рекомендации пользователей '
+            'без отзывов.'
+        )
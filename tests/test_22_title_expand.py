@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+
+def create_reviews(django_user_model, title, count):
+    reviews = []
+    for idx in range(count):
+        author = django_user_model.objects.create_user(
+            username=f'reader{title.pk}x{idx}',
+            email=f'reader{title.pk}x{idx}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=idx % 10 + 1
+        )
+        for _ in range(idx % 3):
+            Comment.objects.create(
+                review=review, author=author, text='Комментарий'
+            )
+        reviews.append(review)
+    return reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleExpand:
+
+    URL_TEMPLATE = '/api/v1/titles/{title_id}/?expand=reviews'
+
+    def test_01_expanded_reviews(self, client, django_user_model):
+        title = Title.objects.create(name='Произведение', year=2000)
+        reviews = create_reviews(django_user_model, title, 12)
+        response = client.get(self.URL_TEMPLATE.format(title_id=title.pk))
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['name'] == title.name
+        assert data['reviews']['count'] == 12, (
+            'Проверьте, что `?expand=reviews` добавляет к произведению '
+            'первую страницу его отзывов.'
+        )
+        assert data['reviews']['next'].endswith(
+            f'/api/v1/titles/{title.pk}/reviews/?page=2'
+        )
+        results = data['reviews']['results']
+        assert len(results) == 10
+        latest = reviews[-1]
+        assert results[0] == {
+            'id': latest.pk,
+            'text': latest.text,
+            'author': latest.author.username,
+            'score': latest.score,
+            'pub_date': results[0]['pub_date'],
+            'comments_count': 11 % 3,
+        }, (
+            'Проверьте, что встроенные отзывы содержат автора и число '
+            'комментариев.'
+        )
+
+        response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert 'reviews' not in response.json()
+
+    def test_02_expanded_queries_are_constant(self, client,
+                                              django_user_model):
+        few = Title.objects.create(name='Мало отзывов', year=2000)
+        many = Title.objects.create(name='Много отзывов', year=2000)
+        create_reviews(django_user_model, few, 1)
+        create_reviews(django_user_model, many, 10)
+        counts = []
+        for title in (few, many):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(
+                    self.URL_TEMPLATE.format(title_id=title.pk)
+                )
+            assert response.status_code == HTTPStatus.OK
+            counts.append(len(context))
+        assert counts[0] == counts[1] <= 3, (
+            'Проверьте, что `?expand=reviews` выполняет фиксированное '
+            'число запросов к БД независимо от числа отзывов.'
+        )
+
+    def test_03_comment_changes_etag(self, client, user_client,
+                                     django_user_model):
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = create_reviews(django_user_model, title, 1)[0]
+        url = self.URL_TEMPLATE.format(title_id=title.pk)
+        etag = client.get(url)['ETag']
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        response = user_client.post(
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+            data={'text': 'Новый комментарий'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag произведения '
+            'со встроенными отзывами.'
+        )
+        assert response.json()['reviews']['results'][0][
+            'comments_count'
+        ] == 1
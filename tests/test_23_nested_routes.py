@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+
+def count_table_selects(context, table):
+    return sum(
+        query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23NestedRoutes:
+
+    def create_review(self, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='Текст')
+        return title, review
+
+    def test_01_lists_do_not_load_parent(self, client, user):
+        title, review = self.create_review(user)
+        for url, table in (
+            (f'/api/v1/titles/{title.pk}/reviews/', 'reviews_title'),
+            (
+                f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+                'reviews_review'
+            ),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['count'] == 1
+            assert count_table_selects(context, table) == 0, (
+                f'Проверьте, что непустой список `{url}` фильтруется по id '
+                'из адреса без загрузки родительского объекта.'
+            )
+
+    def test_02_empty_and_missing_parents(self, client, user):
+        title, review = self.create_review(user)
+        empty_title = Title.objects.create(name='Без отзывов', year=2000)
+        response = client.get(f'/api/v1/titles/{empty_title.pk}/reviews/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0
+
+        for url in (
+            '/api/v1/titles/0/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/0/comments/',
+            f'/api/v1/titles/{empty_title.pk}/reviews/{review.pk}/comments/',
+            f'/api/v1/titles/{empty_title.pk}/reviews/{review.pk}/',
+        ):
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{url}` с несуществующим родителем '
+                'возвращает 404.'
+            )
+
+    def test_03_parent_loaded_once_on_create(self, moderator_client, user):
+        title, review = self.create_review(user)
+        with CaptureQueriesContext(connection) as context:
+            response = moderator_client.post(
+                f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+                data={'text': 'Новый комментарий'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_table_selects(context, 'reviews_review') == 1, (
+            'Проверьте, что при создании комментария отзыв загружается '
+            'один раз.'
+        )
+
+    def test_04_list_queries_do_not_depend_on_page_size(
+        self, client, django_user_model, user
+    ):
+        title, review = self.create_review(user)
+        urls = (
+            f'/api/v1/titles/{title.pk}/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+        )
+
+        def count_queries():
+            counts = []
+            for url in urls:
+                with CaptureQueriesContext(connection) as context:
+                    response = client.get(url)
+                assert response.status_code == HTTPStatus.OK
+                counts.append(len(context))
+            return counts
+
+        single_row_queries = count_queries()
+        for idx in range(9):
+            author = django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            Comment.objects.create(review=review, author=author, text='Текст')
+        assert count_queries() == single_row_queries, (
+            'Проверьте, что списки отзывов и комментариев загружают авторов '
+            'тем же запросом, что и страницу.'
+        )
+
+    def test_05_reviews_comments_count(self, client, user_client,
+                                       moderator_client, user):
+        title, review = self.create_review(user)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        data = client.get(url).json()
+        assert data['results'][0]['comments_count'] == 1, (
+            'Проверьте, что отзывы в списке содержат число комментариев '
+            '`comments_count`.'
+        )
+        etag = client.get(url)['ETag']
+
+        response = moderator_client.post(
+            f'{url}{review.pk}/comments/', data={'text': 'Ещё комментарий'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка отзывов.'
+        )
+        assert response.json()['results'][0]['comments_count'] == 2
+
+        response = user_client.patch(f'{url}{review.pk}/', data={'score': 9})
+        assert response.json()['comments_count'] == 2
+        response = moderator_client.post(
+            url, data={'text': 'Отзыв модератора', 'score': 3}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['comments_count'] == 0
@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.views import ReviewViewSet
+from reviews.models import Review, Title
+
+THREADS_COUNT = 8
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReviewUniqueness:
+
+    def get_url(self, title):
+        return f'/api/v1/titles/{title.pk}/reviews/'
+
+    def test_01_create_without_pre_check(self, user_client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                self.get_url(title), data={'text': 'Отзыв', 'score': 5}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        # Пользователь, произведение, BEGIN, SAVEPOINT, INSERT отзыва,
+        # агрегаты произведения, три запроса первого счётчика гистограммы,
+        # RELEASE и COMMIT: отдельной проверки повторного отзыва нет.
+        assert len(context) == 11, (
+            'Проверьте, что создание отзыва не проверяет повторный отзыв '
+            'отдельным запросом, а полагается на ограничение в БД.'
+        )
+
+        response = user_client.post(
+            self.get_url(title), data={'text': 'Ещё отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert Review.objects.get().score == 5
+
+    def test_02_review_created_after_validation(
+        self, monkeypatch, user_client, user
+    ):
+        title = Title.objects.create(name='Произведение', year=2000)
+        perform_create = ReviewViewSet.perform_create
+
+        def create_competing_review(view, serializer):
+            # Параллельный запрос успевает сохранить отзыв после проверки
+            # данных, но до вставки.
+            Review.objects.create(
+                title=title, author=user, text='Первый отзыв', score=1
+            )
+            perform_create(view, serializer)
+
+        monkeypatch.setattr(
+            ReviewViewSet, 'perform_create', create_competing_review
+        )
+        response = user_client.post(
+            self.get_url(title), data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что отзыв, проигравший гонку параллельному запросу, '
+            'возвращает 400, а не 500.'
+        )
+        assert Review.objects.get().score == 1
+
+    def test_03_concurrent_duplicate_reviews(self, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        token = str(AccessToken.for_user(user))
+        barrier = Barrier(THREADS_COUNT)
+
+        def post_review(score):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            try:
+                barrier.wait()
+                return client.post(
+                    self.get_url(title),
+                    data={'text': 'Отзыв', 'score': score}
+                ).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(THREADS_COUNT) as executor:
+            statuses = list(executor.map(
+                post_review, range(1, THREADS_COUNT + 1)
+            ))
+        assert sorted(statuses) == [HTTPStatus.CREATED] + [
+            HTTPStatus.BAD_REQUEST
+        ] * (THREADS_COUNT - 1), (
+            'Проверьте, что параллельные повторные отзывы одного автора '
+            f'возвращают 400, а не 500. Ответы: {statuses}'
+        )
+        assert Review.objects.filter(title=title, author=user).count() == 1
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from reviews.models import Comment, Review, Title
+from tests.utils import make_cursor, walk
+
+
+def create_reviews_with_comments(django_user_model, count):
+    title = Title.objects.create(name='Произведение', year=2000)
+    first_review = None
+    for idx in range(count):
+        author = django_user_model.objects.create_user(
+            username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+        first_review = first_review or review
+        Comment.objects.create(
+            review=first_review, author=author, text='Комментарий'
+        )
+    # Часть записей с одинаковой датой проверяет tiebreaker по id.
+    same_date = now() - timedelta(days=1)
+    for model in (Review, Comment):
+        model.objects.filter(pk__in=range(3, count, 3)).update(
+            pub_date=same_date
+        )
+    return title, first_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25ReviewCursorPagination:
+
+    def test_01_cursor_walks_reviews_and_comments(self, client,
+                                                  django_user_model):
+        title, review = create_reviews_with_comments(django_user_model, 23)
+        reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+        for url, queryset in (
+            (reviews_url, Review.objects.filter(title=title)),
+            (f'{reviews_url}{review.pk}/comments/', review.comments.all()),
+        ):
+            expected = list(
+                queryset.order_by('-pub_date', '-pk').values_list(
+                    'pk', flat=True
+                )
+            )
+            cursor_url = f'{url}?pagination=cursor'
+            pages = walk(client, cursor_url, 'next')
+            assert [len(page) for page in pages] == [10, 10, 3]
+            assert sum(pages, []) == expected, (
+                f'Проверьте, что курсорная пагинация `{url}` возвращает '
+                'все записи по убыванию даты без пропусков и повторов.'
+            )
+            last_page_url = client.get(
+                client.get(cursor_url).json()['next']
+            ).json()['next']
+            back_pages = walk(client, last_page_url, 'previous')
+            assert sum(reversed(back_pages), []) == expected
+
+        response = client.get('/api/v1/titles/0/reviews/?pagination=cursor')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        for position in (['garbage', 1], [None, 1], [str(now()), 'x']):
+            response = client.get(
+                f'{reviews_url}?pagination=cursor'
+                f'&cursor={make_cursor(position)}'
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор с некорректной датой или id '
+                'отклоняется как некорректный, а не приводит к ошибке '
+                'сервера.'
+            )
+
+    def test_02_cursor_page_uses_index(self, client, django_user_model):
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется только для SQLite.')
+        title, review = create_reviews_with_comments(django_user_model, 23)
+        reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+        for url, table, index in (
+            (reviews_url, 'reviews_review', 'review_title_pub_date_idx'),
+            (
+                f'{reviews_url}{review.pk}/comments/',
+                'reviews_comment',
+                'comment_review_pub_date_idx'
+            ),
+        ):
+            next_url = client.get(f'{url}?pagination=cursor').json()['next']
+            with CaptureQueriesContext(connection) as context:
+                assert client.get(next_url).status_code == HTTPStatus.OK
+            sql = next(
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+                and f'FROM "{table}"' in query['sql']
+            )
+            assert 'OFFSET' not in sql and not any(
+                query['sql'].startswith('SELECT COUNT(')
+                for query in context.captured_queries
+            ), (
+                f'Проверьте, что курсорная пагинация `{url}` не использует '
+                'OFFSET и COUNT(*).'
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            assert index in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что страница курсорной пагинации `{url}` '
+                f'проходит по индексу `{index}` без сортировки. План: {plan}'
+            )
@@ -0,0 +1,106 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from reviews.models import Comment, Review, Title
+
+REVIEWS_URL = '/api/v1/export/reviews.ndjson'
+COMMENTS_URL = '/api/v1/export/comments.ndjson'
+
+
+def read_ndjson(response):
+    assert response.streaming, (
+        'Проверьте, что выгрузка передаётся потоком.'
+    )
+    assert response['Content-Type'] == 'application/x-ndjson'
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26Export:
+
+    def create_reviews(self, django_user_model, count):
+        title = Title.objects.create(name='Произведение', year=2000)
+        for idx in range(count):
+            author = django_user_model.objects.create_user(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            review = Review.objects.create(
+                title=title, author=author, text=f'Отзыв {idx}', score=5
+            )
+            Comment.objects.create(
+                review=review, author=author, text=f'Комментарий {idx}'
+            )
+        return title
+
+    def test_01_export_permissions(self, client, user_client,
+                                   moderator_client):
+        for url in (REVIEWS_URL, COMMENTS_URL):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            for non_admin_client in (user_client, moderator_client):
+                assert non_admin_client.get(url).status_code == (
+                    HTTPStatus.FORBIDDEN
+                ), f'Проверьте, что `{url}` доступен только администратору.'
+
+    def test_02_export_rows(self, admin_client, django_user_model):
+        title = self.create_reviews(django_user_model, 5)
+        rows = read_ndjson(admin_client.get(REVIEWS_URL))
+        assert [row['text'] for row in rows] == [
+            f'Отзыв {idx}' for idx in range(5)
+        ]
+        assert set(rows[0]) == {
+            'id', 'title', 'author', 'text', 'score', 'pub_date'
+        }
+        assert rows[0]['title'] == title.pk
+        assert rows[0]['author'] == 'reader0'
+
+        rows = read_ndjson(admin_client.get(COMMENTS_URL))
+        assert [row['text'] for row in rows] == [
+            f'Комментарий {idx}' for idx in range(5)
+        ]
+        assert rows[0]['title'] == title.pk
+        assert rows[0]['review'] == Review.objects.order_by('pk')[0].pk
+
+    def test_03_export_since(self, admin_client, django_user_model):
+        self.create_reviews(django_user_model, 4)
+        since = now() - timedelta(days=1)
+        review_ids = list(
+            Review.objects.order_by('pk').values_list('pk', flat=True)
+        )
+        Review.objects.filter(pk__in=review_ids[:2]).update(
+            pub_date=since - timedelta(days=1)
+        )
+        rows = read_ndjson(admin_client.get(
+            REVIEWS_URL, {'since': since.isoformat()}
+        ))
+        assert [row['id'] for row in rows] == review_ids[2:], (
+            'Проверьте, что параметр `since` ограничивает дату публикации.'
+        )
+        rows = read_ndjson(admin_client.get(
+            COMMENTS_URL, {'since': since.date().isoformat()}
+        ))
+        assert len(rows) == 4
+
+        for value in ('вчера', '2024-02-30', '2024-01-01T25:00'):
+            response = admin_client.get(REVIEWS_URL, {'since': value})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что несуществующая дата в параметре `since` '
+                'возвращает ответ со статусом 400.'
+            )
+
+    def test_04_export_queries(self, admin_client, django_user_model):
+        self.create_reviews(django_user_model, 12)
+        response = admin_client.get(REVIEWS_URL)
+        with CaptureQueriesContext(connection) as context:
+            rows = read_ndjson(response)
+        assert len(rows) == 12
+        assert len(context) == 1, (
+            'Проверьте, что выгрузка читает строки одним запросом без '
+            'дополнительных запросов на каждую строку.'
+        )
@@ -1,3 +1,5 @@
+import json
+from base64 import urlsafe_b64encode
 from http import HTTPStatus
 
 
@@ -305,3 +307,23 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def walk(client, url, link_key):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорная пагинация не считает общее число '
+            'объектов.'
+        )
+        pages.append([item['id'] for item in data['results']])
+        url = data[link_key]
+    return pages
+
+
+def make_cursor(position, reverse=False):
+    data = json.dumps({'p': position, 'r': int(reverse)})
+    return urlsafe_b64encode(data.encode()).decode()